@@ -7,7 +7,7 @@ from alembic import context
 
 # Import app config
 from app.config import settings
-from app.database import Base
+from app.database import Base, create_extensions
 from app.models import *  # Import all models
 
 # this is the Alembic Config object, which provides
@@ -75,6 +75,9 @@ def run_migrations_online() -> None:
         )
 
         with context.begin_transaction():
+            # Autogenerate doesn't emit CREATE EXTENSION, so make sure the
+            # extensions used by indexes exist before migrating
+            create_extensions(connection)
             context.run_migrations()
 
 
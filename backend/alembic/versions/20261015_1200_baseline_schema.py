@@ -0,0 +1,155 @@
+"""Baseline schema
+
+The tables as they were before hand-written migrations were introduced.
+Databases created from a locally autogenerated "Initial schema" revision
+already have them: run `alembic stamp --purge 71905d2ff457` once, then
+`alembic upgrade head`.
+
+Revision ID: 71905d2ff457
+Revises:
+Create Date: 2026-10-15 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71905d2ff457'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('is_core_member', sa.Boolean(), nullable=True),
+        sa.Column('role', sa.String(length=20), nullable=True),
+        sa.Column('invite_quota', sa.Integer(), nullable=True),
+        sa.Column('invites_used', sa.Integer(), nullable=True),
+        sa.Column('invited_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('registration_ip', postgresql.INET(), nullable=True),
+        sa.Column('registration_user_agent', sa.Text(), nullable=True),
+        sa.Column('registration_fingerprint', sa.String(length=255), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('deleted_reason', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['invited_by_user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_created_at', 'users', ['created_at'])
+    op.create_index('ix_users_deleted_at', 'users', ['deleted_at'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_invited_by_user_id', 'users', ['invited_by_user_id'])
+    op.create_index('ix_users_status', 'users', ['status'])
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table(
+        'invite_tokens',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('token', sa.String(length=64), nullable=False),
+        sa.Column('created_by_user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('used_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('is_used', sa.Boolean(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_revoked', sa.Boolean(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('revoked_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('revoked_reason', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('used_ip', postgresql.INET(), nullable=True),
+        sa.Column('used_user_agent', sa.Text(), nullable=True),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['used_by_user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['revoked_by_user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_invite_tokens_created_by_user_id', 'invite_tokens', ['created_by_user_id'])
+    op.create_index('ix_invite_tokens_expires_at', 'invite_tokens', ['expires_at'])
+    op.create_index('ix_invite_tokens_is_revoked', 'invite_tokens', ['is_revoked'])
+    op.create_index('ix_invite_tokens_is_used', 'invite_tokens', ['is_used'])
+    op.create_index('ix_invite_tokens_token', 'invite_tokens', ['token'], unique=True)
+    op.create_index('ix_invite_tokens_used_by_user_id', 'invite_tokens', ['used_by_user_id'])
+
+    op.create_table(
+        'prune_operations',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('root_user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('affected_user_count', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=False),
+        sa.Column('executed_by_user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('executed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('affected_users', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['root_user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['executed_by_user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_prune_operations_created_at', 'prune_operations', ['created_at'])
+    op.create_index('ix_prune_operations_executed_by_user_id', 'prune_operations', ['executed_by_user_id'])
+    op.create_index('ix_prune_operations_root_user_id', 'prune_operations', ['root_user_id'])
+
+    op.create_table(
+        'user_health_scores',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('subtree_size', sa.Integer(), nullable=True),
+        sa.Column('subtree_active_count', sa.Integer(), nullable=True),
+        sa.Column('subtree_flagged_count', sa.Integer(), nullable=True),
+        sa.Column('subtree_banned_count', sa.Integer(), nullable=True),
+        sa.Column('direct_invitee_health', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('subtree_health', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('overall_health', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('max_depth_below', sa.Integer(), nullable=True),
+        sa.Column('maturity_level', sa.String(length=20), nullable=True),
+        sa.Column('calculated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_health_scores_calculated_at', 'user_health_scores', ['calculated_at'])
+    op.create_index('ix_user_health_scores_overall_health', 'user_health_scores', ['overall_health'])
+    op.create_index('ix_user_health_scores_user_id', 'user_health_scores', ['user_id'])
+
+    op.create_table(
+        'invite_audit_log',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('actor_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('target_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('invite_token_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('event_data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('ip_address', postgresql.INET(), nullable=True),
+        sa.Column('user_agent', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['actor_user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['target_user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['invite_token_id'], ['invite_tokens.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_invite_audit_log_actor_user_id', 'invite_audit_log', ['actor_user_id'])
+    op.create_index('ix_invite_audit_log_created_at', 'invite_audit_log', ['created_at'])
+    op.create_index('ix_invite_audit_log_event_type', 'invite_audit_log', ['event_type'])
+    op.create_index('ix_invite_audit_log_target_user_id', 'invite_audit_log', ['target_user_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('invite_audit_log')
+    op.drop_table('user_health_scores')
+    op.drop_table('prune_operations')
+    op.drop_table('invite_tokens')
+    op.drop_table('users')
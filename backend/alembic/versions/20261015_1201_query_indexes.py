@@ -0,0 +1,76 @@
+"""Query-shaped indexes
+
+Replaces the single-column btree indexes on users, user_health_scores and
+invite_audit_log with the partial, composite, trigram and BRIN indexes the
+queries use. Indexes are built and dropped CONCURRENTLY, outside the
+migration transaction, so writes are not blocked.
+
+Revision ID: 97779f69aa0a
+Revises: 71905d2ff457
+Create Date: 2026-10-15 12:01:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '97779f69aa0a'
+down_revision: Union[str, None] = '71905d2ff457'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NEW_INDEXES = {
+    'idx_users_status_deleted':
+        'ON users (status) WHERE deleted_at IS NULL',
+    'idx_users_created_active':
+        'ON users (created_at DESC, id DESC) WHERE deleted_at IS NULL',
+    'idx_users_created_brin':
+        'ON users USING brin (created_at) WITH (pages_per_range = 32)',
+    'idx_users_username_trgm':
+        'ON users USING gin (username gin_trgm_ops)',
+    'idx_users_email_trgm':
+        'ON users USING gin (email gin_trgm_ops)',
+    'idx_users_invited_by_active':
+        'ON users (invited_by_user_id, created_at DESC) '
+        'WHERE invited_by_user_id IS NOT NULL AND deleted_at IS NULL',
+    'idx_health_user_calculated':
+        'ON user_health_scores (user_id, calculated_at DESC)',
+    'ix_health_calculated_brin':
+        'ON user_health_scores USING brin (calculated_at) WITH (pages_per_range = 32)',
+    'idx_audit_event_id':
+        'ON invite_audit_log (event_type, id DESC)',
+    'ix_audit_created_brin':
+        'ON invite_audit_log USING brin (created_at) WITH (pages_per_range = 32)',
+}
+
+OLD_INDEXES = {
+    'ix_users_status': 'ON users (status)',
+    'ix_users_created_at': 'ON users (created_at)',
+    'ix_users_deleted_at': 'ON users (deleted_at)',
+    'ix_users_invited_by_user_id': 'ON users (invited_by_user_id)',
+    'ix_user_health_scores_user_id': 'ON user_health_scores (user_id)',
+    'ix_user_health_scores_overall_health': 'ON user_health_scores (overall_health)',
+    'ix_user_health_scores_calculated_at': 'ON user_health_scores (calculated_at)',
+    'ix_invite_audit_log_created_at': 'ON invite_audit_log (created_at)',
+}
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        for name, definition in NEW_INDEXES.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY {name} {definition}')
+        for name in OLD_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in OLD_INDEXES.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY {name} {definition}')
+        for name in NEW_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,63 @@
+"""Derive invite token state from timestamps
+
+Drops invite_tokens.is_used / is_revoked (now derived from used_at /
+revoked_at) and their indexes, and replaces the expires_at index with a
+partial index over live tokens. Flagged rows missing their timestamp are
+backfilled first so no token changes state.
+
+Revision ID: 0796e88b0f01
+Revises: 97779f69aa0a
+Create Date: 2026-10-15 12:02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0796e88b0f01'
+down_revision: Union[str, None] = '97779f69aa0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE invite_tokens
+        SET used_at = coalesce(used_at, created_at, now())
+        WHERE is_used AND used_at IS NULL
+    """)
+    op.execute("""
+        UPDATE invite_tokens
+        SET revoked_at = coalesce(revoked_at, now())
+        WHERE is_revoked AND revoked_at IS NULL
+    """)
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_tokens_live_expires ON invite_tokens (expires_at) '
+            'WHERE used_at IS NULL AND revoked_at IS NULL'
+        )
+        for name in ('ix_invite_tokens_expires_at', 'ix_invite_tokens_is_used', 'ix_invite_tokens_is_revoked'):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+    op.drop_column('invite_tokens', 'is_used')
+    op.drop_column('invite_tokens', 'is_revoked')
+
+
+def downgrade() -> None:
+    op.add_column('invite_tokens', sa.Column('is_used', sa.Boolean(), nullable=True))
+    op.add_column('invite_tokens', sa.Column('is_revoked', sa.Boolean(), nullable=True))
+    op.execute("""
+        UPDATE invite_tokens
+        SET is_used = used_at IS NOT NULL,
+            is_revoked = revoked_at IS NOT NULL
+    """)
+
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_invite_tokens_expires_at ON invite_tokens (expires_at)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_invite_tokens_is_used ON invite_tokens (is_used)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_invite_tokens_is_revoked ON invite_tokens (is_revoked)')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_tokens_live_expires')
@@ -0,0 +1,66 @@
+"""Materialized tree paths
+
+Adds users.tree_path (ids from the tree root down to the user) and
+users.depth, backfills them from invited_by_user_id, and indexes
+tree_path with GIN for subtree membership queries. Constant defaults make
+the column adds metadata-only; the backfill is one UPDATE (re-runnable
+with app.scripts.backfill_tree_paths).
+
+Revision ID: 39484748211a
+Revises: 0796e88b0f01
+Create Date: 2026-10-15 12:03:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '39484748211a'
+down_revision: Union[str, None] = '0796e88b0f01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('tree_path', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), server_default=sa.text("'{}'"), nullable=False)
+    )
+    op.add_column(
+        'users',
+        sa.Column('depth', sa.Integer(), server_default=sa.text('0'), nullable=False)
+    )
+
+    op.execute("""
+        WITH RECURSIVE paths AS (
+            SELECT id, ARRAY[id] AS tree_path, 0 AS depth
+            FROM users
+            WHERE invited_by_user_id IS NULL
+
+            UNION ALL
+
+            SELECT u.id, p.tree_path || u.id, p.depth + 1
+            FROM users u
+            INNER JOIN paths p ON u.invited_by_user_id = p.id
+        )
+        UPDATE users
+        SET tree_path = paths.tree_path,
+            depth = paths.depth
+        FROM paths
+        WHERE users.id = paths.id
+    """)
+
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY idx_users_tree_path ON users USING gin (tree_path)')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_users_tree_path')
+
+    op.drop_column('users', 'depth')
+    op.drop_column('users', 'tree_path')
@@ -0,0 +1,56 @@
+"""Native enums for user role/status and prune status
+
+Converts users.role, users.status and prune_operations.status from
+VARCHAR(20) to the user_role, user_status and prune_status enum types
+(with USING casts), filling NULLs with the application defaults and making
+the columns NOT NULL with server defaults. The type change rewrites both
+tables and their indexes under an ACCESS EXCLUSIVE lock; any value outside
+the enum aborts the migration.
+
+Revision ID: 852528d8ff75
+Revises: 39484748211a
+Create Date: 2026-10-15 12:04:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '852528d8ff75'
+down_revision: Union[str, None] = '39484748211a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, enum type, labels, default)
+ENUM_COLUMNS = [
+    ('users', 'status', 'user_status', ('active', 'suspended', 'banned', 'flagged'), 'active'),
+    ('users', 'role', 'user_role', ('user', 'admin', 'superadmin'), 'user'),
+    ('prune_operations', 'status', 'prune_status', ('pending', 'completed', 'failed', 'rolled_back'), 'pending'),
+]
+
+
+def upgrade() -> None:
+    for table, column, type_name, labels, default in ENUM_COLUMNS:
+        label_list = ', '.join(f"'{label}'" for label in labels)
+        op.execute(f'CREATE TYPE {type_name} AS ENUM ({label_list})')
+        op.execute(f"UPDATE {table} SET {column} = '{default}' WHERE {column} IS NULL")
+        op.execute(f"""
+            ALTER TABLE {table}
+                ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name},
+                ALTER COLUMN {column} SET DEFAULT '{default}',
+                ALTER COLUMN {column} SET NOT NULL
+        """)
+
+
+def downgrade() -> None:
+    for table, column, type_name, labels, default in ENUM_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+                ALTER COLUMN {column} DROP NOT NULL,
+                ALTER COLUMN {column} DROP DEFAULT,
+                ALTER COLUMN {column} TYPE VARCHAR(20) USING {column}::text
+        """)
+        op.execute(f'DROP TYPE {type_name}')
@@ -0,0 +1,71 @@
+"""Per-user prune snapshot rows
+
+Moves prune_operations.affected_users (a JSONB array of user snapshots)
+into one prune_affected_users row per affected user, then drops the
+column.
+
+Revision ID: a7e5dc5edfd2
+Revises: 852528d8ff75
+Create Date: 2026-10-15 12:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e5dc5edfd2'
+down_revision: Union[str, None] = '852528d8ff75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'prune_affected_users',
+        sa.Column('operation_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['operation_id'], ['prune_operations.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('operation_id', 'user_id')
+    )
+
+    op.execute("""
+        INSERT INTO prune_affected_users (operation_id, user_id, snapshot)
+        SELECT o.id, CAST(a.snapshot ->> 'id' AS uuid), a.snapshot
+        FROM prune_operations o
+        CROSS JOIN LATERAL jsonb_array_elements(o.affected_users) AS a(snapshot)
+        ON CONFLICT DO NOTHING
+    """)
+
+    op.drop_column('prune_operations', 'affected_users')
+
+
+def downgrade() -> None:
+    op.add_column(
+        'prune_operations',
+        sa.Column(
+            'affected_users',
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'[]'"),
+            nullable=False
+        )
+    )
+
+    op.execute("""
+        UPDATE prune_operations o
+        SET affected_users = a.snapshots
+        FROM (
+            SELECT operation_id, jsonb_agg(snapshot) AS snapshots
+            FROM prune_affected_users
+            GROUP BY operation_id
+        ) a
+        WHERE a.operation_id = o.id
+    """)
+    op.alter_column('prune_operations', 'affected_users', server_default=None)
+
+    op.drop_table('prune_affected_users')
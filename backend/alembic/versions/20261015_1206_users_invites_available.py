@@ -0,0 +1,48 @@
+"""Generated invites_available column
+
+Adds users.invites_available as a STORED generated column and a partial
+index over users who can still invite. Adding a stored generated column
+rewrites the users table under an ACCESS EXCLUSIVE lock; the index is
+built CONCURRENTLY afterwards.
+
+Revision ID: 9c24bfde5173
+Revises: a7e5dc5edfd2
+Create Date: 2026-10-15 12:06:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c24bfde5173'
+down_revision: Union[str, None] = 'a7e5dc5edfd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column(
+            'invites_available',
+            sa.Integer(),
+            sa.Computed('GREATEST(0, invite_quota - invites_used)', persisted=True),
+            nullable=True
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY idx_users_has_invites ON users (invites_available) '
+            'WHERE invites_available > 0'
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_users_has_invites')
+
+    op.drop_column('users', 'invites_available')
@@ -0,0 +1,50 @@
+"""Case-insensitive email and username character check
+
+Converts users.email to citext, so the unique index ignores case; the
+migration fails if two accounts' emails differ only by case, which must
+be merged by hand first. The trigram index is dropped around the type
+change and rebuilt CONCURRENTLY. The username CHECK is added NOT VALID
+and validated separately so existing rows are checked without blocking
+writes.
+
+Revision ID: 7ef9b45748f9
+Revises: 9c24bfde5173
+Create Date: 2026-10-15 12:07:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7ef9b45748f9'
+down_revision: Union[str, None] = '9c24bfde5173'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS citext')
+
+    op.execute('DROP INDEX IF EXISTS idx_users_email_trgm')
+    op.execute('ALTER TABLE users ALTER COLUMN email TYPE citext USING email::citext')
+
+    op.execute(
+        "ALTER TABLE users ADD CONSTRAINT ck_users_username_chars "
+        "CHECK (username ~ '^[A-Za-z0-9_-]+$') NOT VALID"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE users VALIDATE CONSTRAINT ck_users_username_chars')
+        op.execute('CREATE INDEX CONCURRENTLY idx_users_email_trgm ON users USING gin (email gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_users_username_chars')
+
+    op.execute('DROP INDEX IF EXISTS idx_users_email_trgm')
+    op.execute('ALTER TABLE users ALTER COLUMN email TYPE VARCHAR(255) USING email::text')
+
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY idx_users_email_trgm ON users USING gin (email gin_trgm_ops)')
@@ -0,0 +1,54 @@
+"""Look up invite tokens by hash
+
+Adds invite_tokens.token_hash, a STORED generated sha256 of the token
+(adding it rewrites the table under an ACCESS EXCLUSIVE lock), builds its
+unique index CONCURRENTLY and attaches it as the unique constraint, then
+drops the unique index on the token text.
+
+Revision ID: dcde7eaef10e
+Revises: 7ef9b45748f9
+Create Date: 2026-10-15 12:08:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dcde7eaef10e'
+down_revision: Union[str, None] = '7ef9b45748f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'invite_tokens',
+        sa.Column(
+            'token_hash',
+            sa.LargeBinary(),
+            sa.Computed('sha256(CAST(token AS bytea))', persisted=True),
+            nullable=False
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE UNIQUE INDEX CONCURRENTLY invite_tokens_token_hash_key '
+            'ON invite_tokens (token_hash)'
+        )
+        op.execute(
+            'ALTER TABLE invite_tokens ADD CONSTRAINT invite_tokens_token_hash_key '
+            'UNIQUE USING INDEX invite_tokens_token_hash_key'
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_invite_tokens_token')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY ix_invite_tokens_token ON invite_tokens (token)')
+
+    op.drop_constraint('invite_tokens_token_hash_key', 'invite_tokens', type_='unique')
+    op.drop_column('invite_tokens', 'token_hash')
@@ -2,15 +2,19 @@
 Admin API endpoints - requires admin role.
 """
 
-from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy import Text, func, or_, cast, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from uuid import UUID
-from typing import Optional
+from typing import Any, Optional, Dict
 
 from app.database import get_db
 from app.schemas.admin import (
     AdminStatsResponse,
+    AdminUserListItem,
+    AdminUserListResponse,
+    PaginationInfo,
     UserFlagRequest,
     UserFlagResponse,
     PruneRequest,
@@ -24,67 +28,186 @@ from app.schemas.admin import (
     QuotaAdjustResponse,
     AffectedUserSummary
 )
-from app.models.user import User
-from app.models.invite_token import InviteToken
+from app.models.user import User, USER_STATUS
 from app.models.health_score import UserHealthScore
 from app.models.audit_log import InviteAuditLog
-from app.services.prune_service import PruneService
+from app.models.prune_operation import PruneOperation
+from app.services.prune_service import PruneService, prune_preview_cache_key
+from app.tasks.prune_tasks import prune_branch as prune_branch_task
 from app.services.tree_service import TreeService
-from app.core.dependencies import require_admin
-from app.core.exceptions import not_found_error
+from app.services.stats_service import StatsService, ADMIN_STATS_CACHE_KEY
+from app.core.dependencies import require_admin, get_tree_service, get_prune_service, get_stats_service
+from app.core.cache import cache_get, cache_get_raw, cache_set, cache_set_raw, invalidate_namespace, invalidate_cached_users, ADMIN_CACHE_NAMESPACE
+from app.core.pagination import paginate_keyset, paginate_by_id, get_estimated_count
+from app.config import settings
+from app.core.exceptions import bad_request_error, not_found_error
 
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 
+def _usernames_by_id(db: Session, user_ids) -> Dict[UUID, str]:
+    """Resolve a set of user IDs to usernames with a single query."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return {}
+    
+    rows = db.query(User.id, User.username).filter(User.id.in_(user_ids)).all()
+    return dict(rows)
+
+
+def _user_search_filter(search: str):
+    """
+    Build the substring filter for admin user search.
+    
+    LIKE wildcards in the input are escaped so they match literally; the
+    pattern is served by the pg_trgm GIN indexes on username and email.
+    email is citext, whose own ILIKE operator the trigram index can't
+    serve, so it is matched as text.
+    """
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    return or_(
+        User.username.ilike(pattern, escape="\\"),
+        cast(User.email, Text).ilike(pattern, escape="\\")
+    )
+
+
+def _update_user_with_audit(
+    db: Session,
+    user_id: UUID,
+    values: Dict[str, Any],
+    previous_column: str,
+    event_type: str,
+    actor_user_id: UUID,
+    event_data: Dict[str, Any],
+    previous_key: str
+):
+    """
+    Update a user and write the matching audit entry in one statement.
+    
+    The UPDATE returns the column's previous value, which the INSERT into
+    the audit log merges into event_data under previous_key.
+    
+    Args:
+        db: Database session
+        user_id: UUID of user to update
+        values: Column values to set
+        previous_column: Column whose previous value is recorded
+        event_type: Audit event type
+        actor_user_id: UUID of admin making the change
+        event_data: Static audit event data
+        previous_key: event_data key for the previous value
+        
+    Returns:
+        Row with id, username and previous_value
+        
+    Raises:
+        HTTPException: 404 if user not found
+    """
+    previous = aliased(User)
+    updated = (
+        update(User)
+        .where(User.id == user_id, previous.id == User.id)
+        .values(**values)
+        .returning(
+            User.id,
+            User.username,
+            getattr(previous, previous_column).label("previous_value")
+        )
+        .cte("updated")
+    )
+    audit = (
+        insert(InviteAuditLog)
+        .from_select(
+            ["event_type", "actor_user_id", "target_user_id", "event_data"],
+            select(
+                literal(event_type),
+                literal(actor_user_id, User.id.type),
+                updated.c.id,
+                cast(event_data, JSONB).op("||")(
+                    func.jsonb_build_object(previous_key, updated.c.previous_value)
+                )
+            )
+        )
+        .cte("audit")
+    )
+    
+    user = db.execute(
+        select(updated.c.id, updated.c.username, updated.c.previous_value).add_cte(audit)
+    ).first()
+    
+    if user is None:
+        raise not_found_error("User not found")
+    
+    db.commit()
+    
+    return user
+
+
+def _prune_operation_response(operation: PruneOperation) -> PruneResponse:
+    """Build the response describing a queued or finished prune operation."""
+    return PruneResponse(
+        dry_run=False,
+        operation_id=str(operation.id),
+        root_user_id=str(operation.root_user_id),
+        affected_count=operation.affected_user_count,
+        status=operation.status,
+        executed_at=operation.executed_at
+    )
+
+
+def _count_total(db: Session, query, table_name: str, cache_key: Optional[str] = None) -> int:
+    """
+    Get a listing total without a COUNT(*) scan on every request.
+    
+    Unfiltered listings use the planner's table estimate. Filtered
+    listings (identified by cache_key) use an exact count cached for
+    ADMIN_COUNT_CACHE_SECONDS.
+    """
+    if cache_key is None:
+        estimate = get_estimated_count(db, table_name)
+        if estimate is not None:
+            return estimate
+        return query.count()
+    
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    total = query.count()
+    cache_set(
+        cache_key,
+        total,
+        settings.ADMIN_COUNT_CACHE_SECONDS,
+        namespace=ADMIN_CACHE_NAMESPACE
+    )
+    return total
+
+
 @router.get("/stats", response_model=AdminStatsResponse)
-async def get_admin_stats(
+def get_admin_stats(
     current_admin: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    stats_service: StatsService = Depends(get_stats_service)
 ):
     """
     Get dashboard statistics.
     
-    Requires admin role.
+    Requires admin role. Served from a cache that the refresh_admin_stats
+    beat task keeps warm; computed here only when the cache is cold.
     """
-    # User counts
-    total_users = db.query(User).filter(User.deleted_at == None).count()
-    active_users = db.query(User).filter(User.status == "active", User.deleted_at == None).count()
-    flagged_users = db.query(User).filter(User.status == "flagged", User.deleted_at == None).count()
-    banned_users = db.query(User).filter(User.status == "banned", User.deleted_at == None).count()
-    suspended_users = db.query(User).filter(User.status == "suspended", User.deleted_at == None).count()
-    deleted_users = db.query(User).filter(User.deleted_at != None).count()
-    
-    # Invite stats
-    total_invites = db.query(InviteToken).count()
-    used_invites = db.query(InviteToken).filter(InviteToken.is_used == True).count()
-    
-    # Health score average
-    avg_health = db.query(func.avg(UserHealthScore.overall_health)).scalar() or 0.0
-    
-    # Low health users
-    low_health = db.query(UserHealthScore).filter(
-        UserHealthScore.overall_health < 50
-    ).count()
-    
-    return AdminStatsResponse(
-        total_users=total_users,
-        active_users=active_users,
-        flagged_users=flagged_users,
-        banned_users=banned_users,
-        suspended_users=suspended_users,
-        deleted_users=deleted_users,
-        total_invites_issued=total_invites,
-        total_invites_used=used_invites,
-        avg_health_score=float(avg_health),
-        low_health_users=low_health
-    )
+    cached = cache_get_raw(ADMIN_STATS_CACHE_KEY)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    return AdminStatsResponse(**stats_service.refresh_admin_stats())
 
 
-@router.get("/users", response_model=list)
-async def list_users(
-    page: int = Query(1, ge=1),
+@router.get("/users", response_model=AdminUserListResponse)
+def list_users(
+    page: int = Query(1, ge=1, deprecated=True),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     current_admin: User = Depends(require_admin),
@@ -93,52 +216,57 @@ async def list_users(
     """
     List all users with pagination and filters.
     
-    - **page**: Page number (default 1)
+    - **cursor**: Cursor from a previous page's `next_cursor`
+    - **page**: Page number (deprecated, use `cursor`)
     - **page_size**: Results per page (default 50, max 100)
     - **status**: Filter by status (active, flagged, banned, suspended)
     - **search**: Search by username or email
+    
+    Cursor requests skip the total count.
     """
+    if status and status not in USER_STATUS.enums:
+        raise bad_request_error("Invalid status")
+    
     query = db.query(User).filter(User.deleted_at == None)
     
     if status:
         query = query.filter(User.status == status)
     
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (User.username.ilike(search_term)) | (User.email.ilike(search_term))
-        )
+        query = query.filter(_user_search_filter(search))
+    
+    total = None
+    if not cursor:
+        count_key = f"admin:users:count:{status or ''}:{search or ''}" if (status or search) else None
+        total = _count_total(db, query, "users", cache_key=count_key)
+    
+    users, next_cursor = paginate_keyset(
+        query,
+        User.created_at,
+        User.id,
+        page_size,
+        cursor=cursor,
+        offset=(page - 1) * page_size,
+        id_type=UUID
+    )
     
-    total = query.count()
-    offset = (page - 1) * page_size
-    
-    users = query.offset(offset).limit(page_size).all()
-    
-    return {
-        "users": [
-            {
-                "id": str(u.id),
-                "username": u.username,
-                "email": u.email,
-                "status": u.status,
-                "role": u.role,
-                "created_at": u.created_at.isoformat()
-            }
-            for u in users
-        ],
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "pages": (total + page_size - 1) // page_size
-        }
-    }
+    return AdminUserListResponse(
+        users=[AdminUserListItem.model_validate(u) for u in users],
+        pagination=PaginationInfo(
+            page=None if cursor else page,
+            page_size=page_size,
+            total=total,
+            pages=(total + page_size - 1) // page_size if total is not None else None,
+            next_cursor=next_cursor
+        )
+    )
 
 
 @router.get("/users/{user_id}", response_model=UserDetailedResponse)
-async def get_user_detailed(
+def get_user_detailed(
     user_id: UUID,
     current_admin: User = Depends(require_admin),
+    tree_service: TreeService = Depends(get_tree_service),
     db: Session = Depends(get_db)
 ):
     """
@@ -146,15 +274,9 @@ async def get_user_detailed(
     
     Includes forensic data and health scores.
     """
-    tree_service = TreeService(db)
-    user = tree_service.get_user_or_404(user_id)
-    
-    # Get invited by username
-    invited_by_username = None
-    if user.invited_by_user_id:
-        invited_by = db.query(User).filter(User.id == user.invited_by_user_id).first()
-        if invited_by:
-            invited_by_username = invited_by.username
+    # Inviter is joined into the user query
+    user = tree_service.get_user_or_404(user_id, joinedload(User.invited_by))
+    invited_by_username = user.invited_by.username if user.invited_by else None
     
     # Get health score
     health_record = db.query(UserHealthScore).filter(
@@ -190,7 +312,7 @@ async def get_user_detailed(
 
 
 @router.post("/users/{user_id}/flag", response_model=UserFlagResponse)
-async def flag_user(
+def flag_user(
     user_id: UUID,
     request: UserFlagRequest,
     current_admin: User = Depends(require_admin),
@@ -201,25 +323,18 @@ async def flag_user(
     
     Changes user status to 'flagged'.
     """
-    tree_service = TreeService(db)
-    user = tree_service.get_user_or_404(user_id)
-    
-    old_status = user.status
-    user.status = "flagged"
-    
-    # Log to audit
-    audit_entry = InviteAuditLog(
+    user = _update_user_with_audit(
+        db,
+        user_id,
+        values={"status": "flagged"},
+        previous_column="status",
         event_type="user_flagged",
         actor_user_id=current_admin.id,
-        target_user_id=user.id,
-        event_data={
-            "reason": request.reason,
-            "old_status": old_status
-        }
+        event_data={"reason": request.reason},
+        previous_key="old_status"
     )
-    db.add(audit_entry)
-    
-    db.commit()
+    invalidate_cached_users(user.id)
+    invalidate_namespace(ADMIN_CACHE_NAMESPACE)
     
     return UserFlagResponse(
         success=True,
@@ -230,7 +345,7 @@ async def flag_user(
 
 
 @router.post("/users/{user_id}/unflag", response_model=UserFlagResponse)
-async def unflag_user(
+def unflag_user(
     user_id: UUID,
     current_admin: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -238,26 +353,18 @@ async def unflag_user(
     """
     Remove flag from user (set back to active).
     """
-    tree_service = TreeService(db)
-    user = tree_service.get_user_or_404(user_id)
-    
-    old_status = user.status
-    user.status = "active"
-    
-    # Log to audit
-    audit_entry = InviteAuditLog(
+    user = _update_user_with_audit(
+        db,
+        user_id,
+        values={"status": "active"},
+        previous_column="status",
         event_type="user_status_changed",
         actor_user_id=current_admin.id,
-        target_user_id=user.id,
-        event_data={
-            "action": "unflagged",
-            "old_status": old_status,
-            "new_status": "active"
-        }
+        event_data={"action": "unflagged", "new_status": "active"},
+        previous_key="old_status"
     )
-    db.add(audit_entry)
-    
-    db.commit()
+    invalidate_cached_users(user.id)
+    invalidate_namespace(ADMIN_CACHE_NAMESPACE)
     
     return UserFlagResponse(
         success=True,
@@ -268,11 +375,11 @@ async def unflag_user(
 
 
 @router.post("/prune", response_model=PruneResponse)
-async def prune_branch(
+def prune_branch(
     request: PruneRequest,
     http_request: Request,
     current_admin: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    prune_service: PruneService = Depends(get_prune_service)
 ):
     """
     Prune a branch (soft delete all descendants).
@@ -283,13 +390,14 @@ async def prune_branch(
     
     This is a destructive operation that should be used carefully.
     """
-    prune_service = PruneService(db)
-    
-    # Get affected users
-    affected_users = prune_service.get_affected_users(UUID(request.root_user_id))
-    
     if request.dry_run:
-        # Preview mode
+        # Preview mode, cached briefly so repeated previews skip the CTE
+        preview_key = prune_preview_cache_key(request.root_user_id)
+        affected_users = cache_get(preview_key)
+        if affected_users is None:
+            affected_users = prune_service.get_affected_users(request.root_user_id)
+            cache_set(preview_key, affected_users, settings.PRUNE_PREVIEW_CACHE_SECONDS)
+        
         affected_summaries = [
             AffectedUserSummary(
                 id=u["id"],
@@ -304,78 +412,117 @@ async def prune_branch(
         
         return PruneResponse(
             dry_run=True,
-            root_user_id=request.root_user_id,
+            root_user_id=str(request.root_user_id),
             affected_count=len(affected_users),
             affected_users=affected_summaries
         )
     
-    # Execute prune
+    # Record the operation and hand the branch update to a worker
     client_ip = http_request.client.host if http_request.client else None
     user_agent = http_request.headers.get("user-agent")
     
-    operation = prune_service.execute_prune(
-        root_user_id=UUID(request.root_user_id),
+    operation = prune_service.create_prune_operation(
+        root_user_id=request.root_user_id,
         reason=request.reason,
-        executed_by_user_id=current_admin.id,
-        ip_address=client_ip,
-        user_agent=user_agent
+        executed_by_user_id=current_admin.id
     )
+    prune_branch_task.delay(str(operation.id), client_ip, user_agent)
+    invalidate_namespace(ADMIN_CACHE_NAMESPACE)
     
-    return PruneResponse(
-        dry_run=False,
-        operation_id=str(operation.id),
-        root_user_id=request.root_user_id,
-        affected_count=operation.affected_user_count,
-        status=operation.status,
-        executed_at=operation.executed_at
-    )
+    return _prune_operation_response(operation)
+
+
+@router.get("/prune-operations/{operation_id}", response_model=PruneResponse)
+def get_prune_operation(
+    operation_id: UUID,
+    current_admin: User = Depends(require_admin),
+    prune_service: PruneService = Depends(get_prune_service)
+):
+    """
+    Get the status of a prune operation.
+    
+    Poll this after queueing a prune until status is no longer 'pending'.
+    """
+    operation = prune_service.get_prune_operation(operation_id)
+    
+    return _prune_operation_response(operation)
 
 
 @router.get("/prune-history", response_model=PruneHistoryResponse)
-async def get_prune_history(
-    page: int = Query(1, ge=1),
+def get_prune_history(
+    page: int = Query(1, ge=1, deprecated=True),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     current_admin: User = Depends(require_admin),
+    prune_service: PruneService = Depends(get_prune_service),
     db: Session = Depends(get_db)
 ):
     """
     Get history of prune operations.
+    
+    - **cursor**: Cursor from a previous page's `next_cursor`
+    - **page**: Page number (deprecated, use `cursor`)
+    - **page_size**: Results per page
+    
+    Cursor requests skip the total, which is otherwise the planner's estimate.
     """
-    prune_service = PruneService(db)
+    cache_key = f"admin:prune-history:{cursor or page}:{page_size}"
+    cached = cache_get_raw(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    operations, next_cursor = prune_service.get_prune_operations(
+        limit=page_size,
+        offset=(page - 1) * page_size,
+        cursor=cursor
+    )
     
-    offset = (page - 1) * page_size
-    operations = prune_service.get_prune_operations(limit=page_size, offset=offset)
+    # Resolve all referenced usernames in one query
+    name_by_id = _usernames_by_id(
+        db,
+        {op.root_user_id for op in operations} | {op.executed_by_user_id for op in operations}
+    )
     
-    items = []
-    for op in operations:
-        root_user = db.query(User).filter(User.id == op.root_user_id).first()
-        executed_by = db.query(User).filter(User.id == op.executed_by_user_id).first()
-        
-        items.append(PruneHistoryItem(
+    items = [
+        PruneHistoryItem(
             id=str(op.id),
             root_user_id=str(op.root_user_id),
-            root_username=root_user.username if root_user else "Unknown",
+            root_username=name_by_id.get(op.root_user_id, "Unknown"),
             affected_count=op.affected_user_count,
             reason=op.reason,
-            executed_by_username=executed_by.username if executed_by else "Unknown",
+            executed_by_username=name_by_id.get(op.executed_by_user_id, "Unknown"),
             status=op.status,
             created_at=op.created_at,
             executed_at=op.executed_at
-        ))
+        )
+        for op in operations
+    ]
     
-    from app.models.prune_operation import PruneOperation
-    total = db.query(PruneOperation).count()
+    total = None
+    if not cursor:
+        total = _count_total(db, db.query(PruneOperation), "prune_operations")
     
-    return PruneHistoryResponse(
+    response = PruneHistoryResponse(
         operations=items,
-        total=total
+        total=total,
+        next_cursor=next_cursor
+    )
+    
+    cache_set_raw(
+        cache_key,
+        response.model_dump_json(),
+        settings.ADMIN_LIST_CACHE_SECONDS,
+        namespace=ADMIN_CACHE_NAMESPACE
     )
+    
+    return response
 
 
 @router.get("/audit-log", response_model=AuditLogResponse)
-async def get_audit_log(
-    page: int = Query(1, ge=1),
+def get_audit_log(
+    page: int = Query(1, ge=1, deprecated=True),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     event_type: Optional[str] = Query(None),
     current_admin: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -383,45 +530,76 @@ async def get_audit_log(
     """
     Get audit log entries.
     
-    - **page**: Page number
+    - **cursor**: Cursor from a previous page's `next_cursor`
+    - **page**: Page number (deprecated, use `cursor`)
     - **page_size**: Results per page
     - **event_type**: Filter by event type
+    
+    Cursor requests skip the total count.
     """
+    cache_key = f"admin:audit-log:{cursor or page}:{page_size}:{event_type or ''}"
+    cached = cache_get_raw(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     query = db.query(InviteAuditLog)
     
     if event_type:
         query = query.filter(InviteAuditLog.event_type == event_type)
     
-    total = query.count()
-    offset = (page - 1) * page_size
+    total = None
+    if not cursor:
+        count_key = f"admin:audit-log:count:{event_type}" if event_type else None
+        total = _count_total(db, query, "invite_audit_log", cache_key=count_key)
+    
+    # id follows insertion order, so page on the primary key alone
+    entries, next_cursor = paginate_by_id(
+        query,
+        InviteAuditLog.id,
+        page_size,
+        cursor=cursor,
+        offset=(page - 1) * page_size
+    )
     
-    entries = query.order_by(InviteAuditLog.created_at.desc()).offset(offset).limit(page_size).all()
+    # Resolve all referenced usernames in one query
+    name_by_id = _usernames_by_id(
+        db,
+        {e.actor_user_id for e in entries} | {e.target_user_id for e in entries}
+    )
     
-    audit_entries = []
-    for entry in entries:
-        actor = db.query(User).filter(User.id == entry.actor_user_id).first() if entry.actor_user_id else None
-        target = db.query(User).filter(User.id == entry.target_user_id).first() if entry.target_user_id else None
-        
-        audit_entries.append(AuditLogEntry(
+    audit_entries = [
+        AuditLogEntry(
             id=entry.id,
             event_type=entry.event_type,
-            actor_username=actor.username if actor else None,
-            target_username=target.username if target else None,
+            actor_username=name_by_id.get(entry.actor_user_id),
+            target_username=name_by_id.get(entry.target_user_id),
             event_data=entry.event_data,
             created_at=entry.created_at,
             ip_address=str(entry.ip_address) if entry.ip_address else None
-        ))
+        )
+        for entry in entries
+    ]
     
-    return AuditLogResponse(
+    response = AuditLogResponse(
         entries=audit_entries,
         total=total,
-        page=page,
-        page_size=page_size
+        page=None if cursor else page,
+        page_size=page_size,
+        next_cursor=next_cursor
+    )
+    
+    cache_set_raw(
+        cache_key,
+        response.model_dump_json(),
+        settings.ADMIN_LIST_CACHE_SECONDS,
+        namespace=ADMIN_CACHE_NAMESPACE
     )
+    
+    return response
 
 
 @router.post("/quota/adjust", response_model=QuotaAdjustResponse)
-async def adjust_user_quota(
+def adjust_user_quota(
     request: QuotaAdjustRequest,
     current_admin: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -433,32 +611,22 @@ async def adjust_user_quota(
     - **new_quota**: New quota value
     - **reason**: Reason for adjustment
     """
-    tree_service = TreeService(db)
-    user = tree_service.get_user_or_404(UUID(request.user_id))
-    
-    old_quota = user.invite_quota
-    user.invite_quota = request.new_quota
-    
-    # Log to audit
-    audit_entry = InviteAuditLog(
+    user = _update_user_with_audit(
+        db,
+        request.user_id,
+        values={"invite_quota": request.new_quota},
+        previous_column="invite_quota",
         event_type="quota_adjusted",
         actor_user_id=current_admin.id,
-        target_user_id=user.id,
-        event_data={
-            "old_quota": old_quota,
-            "new_quota": request.new_quota,
-            "reason": request.reason
-        }
+        event_data={"new_quota": request.new_quota, "reason": request.reason},
+        previous_key="old_quota"
     )
-    db.add(audit_entry)
-    
-    db.commit()
+    invalidate_namespace(ADMIN_CACHE_NAMESPACE)
     
     return QuotaAdjustResponse(
         success=True,
         user_id=str(user.id),
-        old_quota=old_quota,
+        old_quota=user.previous_value,
         new_quota=request.new_quota,
         message=f"Quota adjusted for {user.username}"
     )
-
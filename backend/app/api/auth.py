@@ -3,9 +3,7 @@ Authentication API endpoints.
 """
 
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
 
-from app.database import get_db
 from app.schemas.auth import (
     RegisterRequest,
     LoginRequest,
@@ -15,7 +13,8 @@ from app.schemas.auth import (
     UserMeResponse
 )
 from app.services.auth_service import AuthService
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_auth_service
+from app.core.security import create_token_pair
 from app.models.user import User
 
 
@@ -23,10 +22,10 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=AuthResponse, status_code=201)
-async def register(
+def register(
     request: RegisterRequest,
     http_request: Request,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Register a new user with an invite token.
@@ -39,8 +38,6 @@ async def register(
     
     Returns access and refresh tokens.
     """
-    auth_service = AuthService(db)
-    
     # Capture forensic data
     client_ip = http_request.client.host if http_request.client else None
     user_agent = http_request.headers.get("user-agent")
@@ -57,9 +54,7 @@ async def register(
     )
     
     # Generate tokens
-    from app.core.security import create_access_token, create_refresh_token
-    access_token = create_access_token(str(user.id))
-    refresh_token = create_refresh_token(str(user.id))
+    access_token, refresh_token = create_token_pair(str(user.id))
     
     return AuthResponse(
         user_id=str(user.id),
@@ -71,17 +66,15 @@ async def register(
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(
+def login(
     request: LoginRequest,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Login with email and password.
     
     Returns access and refresh tokens.
     """
-    auth_service = AuthService(db)
-    
     user, access_token, refresh_token = auth_service.login(
         email=request.email,
         password=request.password
@@ -97,24 +90,22 @@ async def login(
 
 
 @router.post("/refresh", response_model=RefreshResponse)
-async def refresh_token(
+def refresh_token(
     request: RefreshRequest,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Refresh access token using refresh token.
     
     Returns new access token.
     """
-    auth_service = AuthService(db)
-    
     new_access_token = auth_service.refresh_access_token(request.refresh_token)
     
     return RefreshResponse(access_token=new_access_token)
 
 
 @router.get("/me", response_model=UserMeResponse)
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -122,18 +113,7 @@ async def get_current_user_info(
     
     Requires valid access token.
     """
-    return UserMeResponse(
-        id=str(current_user.id),
-        username=current_user.username,
-        email=current_user.email,
-        role=current_user.role,
-        is_core_member=current_user.is_core_member,
-        invite_quota=current_user.invite_quota,
-        invites_used=current_user.invites_used,
-        invites_available=current_user.invites_available,
-        status=current_user.status,
-        created_at=current_user.created_at.isoformat()
-    )
+    return UserMeResponse.model_validate(current_user)
 
 
 @router.post("/logout")
@@ -17,7 +17,7 @@ from app.schemas.invite import (
     InviteTokenResponse
 )
 from app.services.invite_service import InviteService
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_invite_service
 from app.core.exceptions import InsufficientQuotaException, bad_request_error
 from app.models.user import User
 from app.config import settings
@@ -33,10 +33,11 @@ def build_invite_url(token: str) -> str:
 
 
 @router.post("/create", response_model=InviteCreateResponse, status_code=201)
-async def create_invites(
+def create_invites(
     request: InviteCreateRequest,
     http_request: Request,
     current_user: User = Depends(get_current_user),
+    invite_service: InviteService = Depends(get_invite_service),
     db: Session = Depends(get_db)
 ):
     """
@@ -47,8 +48,6 @@ async def create_invites(
     
     Requires sufficient invite quota.
     """
-    invite_service = InviteService(db)
-    
     # Capture metadata
     client_ip = http_request.client.host if http_request.client else None
     user_agent = http_request.headers.get("user-agent")
@@ -89,17 +88,15 @@ async def create_invites(
 
 
 @router.get("/my-invites", response_model=InviteListResponse)
-async def get_my_invites(
+def get_my_invites(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    invite_service: InviteService = Depends(get_invite_service)
 ):
     """
     Get all invite tokens created by current user.
     
     Returns list of tokens with usage status.
     """
-    invite_service = InviteService(db)
-    
     tokens = invite_service.get_user_tokens(current_user.id)
     
     token_responses = [
@@ -128,17 +125,15 @@ async def get_my_invites(
 
 
 @router.get("/validate/{token}", response_model=InviteValidateResponse)
-async def validate_invite(
+def validate_invite(
     token: str = Path(..., description="Invite token to validate"),
-    db: Session = Depends(get_db)
+    invite_service: InviteService = Depends(get_invite_service)
 ):
     """
     Validate an invite token (public endpoint - no auth required).
     
     Returns whether the token is valid and basic information.
     """
-    invite_service = InviteService(db)
-    
     invite_token = invite_service.validate_token(token)
     
     if not invite_token:
@@ -172,12 +167,12 @@ async def validate_invite(
 
 
 @router.post("/revoke/{token_id}", response_model=InviteRevokeResponse)
-async def revoke_invite(
+def revoke_invite(
     token_id: UUID,
     request: InviteRevokeRequest,
     http_request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    invite_service: InviteService = Depends(get_invite_service)
 ):
     """
     Revoke an invite token.
@@ -185,8 +180,6 @@ async def revoke_invite(
     Can only revoke tokens you created (or admin can revoke any).
     Credits back to quota if not expired.
     """
-    invite_service = InviteService(db)
-    
     # Capture metadata
     client_ip = http_request.client.host if http_request.client else None
     user_agent = http_request.headers.get("user-agent")
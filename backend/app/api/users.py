@@ -3,10 +3,8 @@ User and tree API endpoints.
 """
 
 from fastapi import APIRouter, Depends, Path
-from sqlalchemy.orm import Session
 from uuid import UUID
 
-from app.database import get_db
 from app.schemas.user import (
     UserProfile,
     UserPublicProfile,
@@ -18,7 +16,7 @@ from app.schemas.user import (
 )
 from app.services.tree_service import TreeService
 from app.services.health_service import HealthService
-from app.core.dependencies import get_current_user, get_optional_user
+from app.core.dependencies import get_current_user, get_optional_user, require_self_or_admin, get_tree_service, get_health_service
 from app.core.exceptions import forbidden_error
 from app.models.user import User
 
@@ -27,26 +25,15 @@ router = APIRouter(prefix="/api/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserProfile)
-async def get_my_profile(current_user: User = Depends(get_current_user)):
+def get_my_profile(current_user: User = Depends(get_current_user)):
     """Get current user's profile."""
-    return UserProfile(
-        id=str(current_user.id),
-        username=current_user.username,
-        email=current_user.email,
-        created_at=current_user.created_at,
-        status=current_user.status,
-        is_core_member=current_user.is_core_member,
-        role=current_user.role,
-        invite_quota=current_user.invite_quota,
-        invites_used=current_user.invites_used,
-        invites_available=current_user.invites_available
-    )
+    return UserProfile.model_validate(current_user)
 
 
 @router.get("/{user_id}", response_model=UserPublicProfile)
-async def get_user_profile(
+def get_user_profile(
     user_id: UUID,
-    db: Session = Depends(get_db),
+    tree_service: TreeService = Depends(get_tree_service),
     current_user: User = Depends(get_optional_user)
 ):
     """
@@ -54,24 +41,17 @@ async def get_user_profile(
     
     Returns limited information for privacy.
     """
-    tree_service = TreeService(db)
     user = tree_service.get_user_or_404(user_id)
     
-    return UserPublicProfile(
-        id=str(user.id),
-        username=user.username,
-        created_at=user.created_at,
-        status=user.status,
-        is_core_member=user.is_core_member
-    )
+    return UserPublicProfile.model_validate(user)
 
 
 @router.get("/{user_id}/tree", response_model=UserTreeResponse)
-async def get_user_tree(
+def get_user_tree(
     user_id: UUID,
     max_depth: int = 5,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_self_or_admin("Can only view your own tree")),
+    tree_service: TreeService = Depends(get_tree_service)
 ):
     """
     Get invite tree for a user (their descendants).
@@ -80,52 +60,13 @@ async def get_user_tree(
     
     Users can only view their own tree unless they're an admin.
     """
-    # Privacy check
-    if str(current_user.id) != str(user_id) and not current_user.is_admin:
-        raise forbidden_error("Can only view your own tree")
-    
-    tree_service = TreeService(db)
-    health_service = HealthService(db)
-    
-    # Build tree structure
+    # Build tree structure (includes latest health scores)
     tree_data = tree_service.build_tree_structure(user_id, max_depth)
     
     if not tree_data:
         raise forbidden_error("Tree not found")
     
-    # Get health scores for nodes
-    def add_health_scores(node):
-        health_record = health_service.get_latest_health_score(UUID(node["id"]))
-        if health_record:
-            node["health_score"] = float(health_record.overall_health)
-            node["maturity_level"] = health_record.maturity_level
-        else:
-            node["health_score"] = None
-            node["maturity_level"] = "branch"
-        
-        node["children_count"] = len(node["children"])
-        
-        for child in node["children"]:
-            add_health_scores(child)
-    
-    add_health_scores(tree_data)
-    
-    # Convert to TreeNode
-    def dict_to_tree_node(data) -> TreeNode:
-        children = [dict_to_tree_node(child) for child in data.get("children", [])]
-        return TreeNode(
-            id=data["id"],
-            username=data["username"],
-            status=data["status"],
-            created_at=data["created_at"],
-            depth=data["depth"],
-            health_score=data.get("health_score"),
-            maturity_level=data.get("maturity_level"),
-            children_count=data["children_count"],
-            children=children
-        )
-    
-    tree_node = dict_to_tree_node(tree_data)
+    tree_node = TreeNode.model_validate(tree_data)
     
     # Get total descendants
     stats = tree_service.get_subtree_stats(user_id)
@@ -139,22 +80,16 @@ async def get_user_tree(
 
 
 @router.get("/{user_id}/ancestors", response_model=UserAncestorsResponse)
-async def get_user_ancestors(
+def get_user_ancestors(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_self_or_admin("Can only view your own ancestry")),
+    tree_service: TreeService = Depends(get_tree_service)
 ):
     """
     Get path to root (all ancestors).
     
     Shows the invite chain from user to root.
     """
-    # Privacy check
-    if str(current_user.id) != str(user_id) and not current_user.is_admin:
-        raise forbidden_error("Can only view your own ancestry")
-    
-    tree_service = TreeService(db)
-    
     ancestors_data = tree_service.get_ancestors(user_id)
     
     ancestors = [
@@ -178,23 +113,17 @@ async def get_user_ancestors(
 
 
 @router.get("/{user_id}/stats", response_model=UserStatsResponse)
-async def get_user_stats(
+def get_user_stats(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_self_or_admin("Can only view your own stats")),
+    tree_service: TreeService = Depends(get_tree_service),
+    health_service: HealthService = Depends(get_health_service)
 ):
     """
     Get statistics about a user's invite tree.
     
     Users can only view their own stats unless they're an admin.
     """
-    # Privacy check
-    if str(current_user.id) != str(user_id) and not current_user.is_admin:
-        raise forbidden_error("Can only view your own stats")
-    
-    tree_service = TreeService(db)
-    health_service = HealthService(db)
-    
     stats = tree_service.get_subtree_stats(user_id)
     health_record = health_service.get_latest_health_score(user_id)
     
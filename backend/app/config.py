@@ -3,6 +3,7 @@ Application configuration using Pydantic Settings.
 Loads environment variables from .env file.
 """
 
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
@@ -17,9 +18,15 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 5
     
     # Redis
     REDIS_URL: str
+    # One connection per threadpool worker (AnyIO's default limit is 40)
+    REDIS_POOL_SIZE: int = 40
     
     # JWT
     JWT_SECRET_KEY: str
@@ -27,10 +34,13 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000"
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
@@ -54,6 +64,14 @@ class Settings(BaseSettings):
     SUPPORTING_TRUNK_MIN_DEPTH: int = 3
     SUPPORTING_TRUNK_MIN_SIZE: int = 10
     
+    # Caching (seconds)
+    ADMIN_STATS_CACHE_SECONDS: int = 30
+    ADMIN_STATS_REFRESH_SECONDS: int = 20  # Beat refresh, kept below the TTL
+    ADMIN_LIST_CACHE_SECONDS: int = 10
+    ADMIN_COUNT_CACHE_SECONDS: int = 60
+    PRUNE_PREVIEW_CACHE_SECONDS: int = 60
+    USER_CACHE_SECONDS: int = 900
+    
     # Sentry (optional)
     SENTRY_DSN: str = ""
     
@@ -0,0 +1,147 @@
+"""
+Redis-backed cache helpers.
+
+The cache is best-effort: any Redis failure is treated as a miss so
+requests fall through to the database instead of erroring.
+"""
+
+from typing import Any, Optional, Union
+
+import orjson
+import redis
+
+from app.config import settings
+
+
+# Sized to the endpoint threadpool so cache calls never queue for a
+# connection; if they ever do, they give up after a second (a miss)
+redis_pool = redis.BlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_POOL_SIZE,
+    timeout=1,
+    decode_responses=False,
+    socket_connect_timeout=1,
+    socket_timeout=1,
+    health_check_interval=30
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
+
+# Namespace for admin listings and counts, dropped whenever users change
+ADMIN_CACHE_NAMESPACE = "admin"
+
+
+def _namespace_set_key(namespace: str) -> str:
+    """Key of the set tracking all cache keys in a namespace."""
+    return f"cache-ns:{namespace}"
+
+
+def cache_get_raw(key: str) -> Optional[bytes]:
+    """
+    Get a cached value as stored, without decoding.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Raw bytes, or None on a miss or Redis error
+    """
+    try:
+        return redis_client.get(key)
+    except redis.RedisError:
+        return None
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """
+    Get a cached JSON value.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Decoded value, or None on a miss or Redis error
+    """
+    cached = cache_get_raw(key)
+    if cached is None:
+        return None
+
+    return orjson.loads(cached)
+
+
+def cache_set_raw(
+    key: str,
+    payload: Union[bytes, str],
+    ttl: int,
+    namespace: Optional[str] = None
+) -> None:
+    """
+    Store an already-encoded value with a TTL.
+
+    Args:
+        key: Cache key
+        payload: Encoded value (e.g. a response's JSON)
+        ttl: Time to live in seconds
+        namespace: Optional namespace used for bulk invalidation
+    """
+    try:
+        pipe = redis_client.pipeline()
+        pipe.setex(key, ttl, payload)
+        if namespace:
+            ns_key = _namespace_set_key(namespace)
+            pipe.sadd(ns_key, key)
+            # Only ever extend the set's TTL so it outlives every member
+            # (NX sets it on a new set, GT extends it; Redis 7+)
+            pipe.expire(ns_key, ttl, nx=True)
+            pipe.expire(ns_key, ttl, gt=True)
+        pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+def cache_set(key: str, value: Any, ttl: int, namespace: Optional[str] = None) -> None:
+    """
+    Store a JSON-serializable value with a TTL.
+
+    Args:
+        key: Cache key
+        value: Value to cache
+        ttl: Time to live in seconds
+        namespace: Optional namespace used for bulk invalidation
+    """
+    cache_set_raw(key, orjson.dumps(value, default=str), ttl, namespace)
+
+
+def user_cache_key(user_id: Any) -> str:
+    """Key of the cached identity (id, role, status) of a user."""
+    return f"user:{user_id}"
+
+
+def invalidate_cached_users(*user_ids: Any) -> None:
+    """Drop cached identities after a user's role, status or deletion changes."""
+    cache_delete(*(user_cache_key(user_id) for user_id in user_ids))
+
+
+def cache_delete(*keys: str) -> None:
+    """Delete one or more cache keys."""
+    if not keys:
+        return
+
+    try:
+        redis_client.delete(*keys)
+    except redis.RedisError:
+        pass
+
+
+def invalidate_namespace(namespace: str) -> None:
+    """
+    Delete every key cached under a namespace.
+
+    Args:
+        namespace: Namespace passed to cache_set
+    """
+    ns_key = _namespace_set_key(namespace)
+    try:
+        keys = redis_client.smembers(ns_key)
+        redis_client.delete(ns_key, *keys)
+    except redis.RedisError:
+        pass
@@ -5,20 +5,70 @@ FastAPI dependency injection functions.
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.orm import Session, make_transient_to_detached
+from typing import Callable, Optional
+from uuid import UUID
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
+from app.core.cache import cache_get, cache_set, user_cache_key
 from app.core.security import verify_token
 from app.core.exceptions import unauthorized_error, forbidden_error
+from app.services.auth_service import AuthService
+from app.services.health_service import HealthService
+from app.services.invite_service import InviteService
+from app.services.prune_service import PruneService
+from app.services.stats_service import StatsService
+from app.services.tree_service import TreeService
 
 
 # Bearer token security scheme
 security = HTTPBearer()
 
 
-async def get_current_user(
+def _load_active_user(db: Session, user_id: str) -> Optional[User]:
+    """
+    Load a non-deleted user, serving its identity from Redis when cached.
+    
+    On a cache hit the user is attached to the session with only id, role,
+    status and deleted_at loaded; other columns load lazily on first access,
+    so authorization checks cost no query.
+    
+    Args:
+        db: Database session
+        user_id: User UUID as string (from the token subject)
+        
+    Returns:
+        User object, or None if not found or deleted
+    """
+    cached = cache_get(user_cache_key(user_id))
+    if cached is not None:
+        user = User(
+            id=UUID(cached["id"]),
+            role=cached["role"],
+            status=cached["status"],
+            deleted_at=None
+        )
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    
+    user = db.query(User).filter(
+        User.id == user_id,
+        User.deleted_at == None
+    ).first()
+    
+    if user is not None:
+        cache_set(
+            user_cache_key(user_id),
+            {"id": str(user.id), "role": user.role, "status": user.status},
+            settings.USER_CACHE_SECONDS
+        )
+    
+    return user
+
+
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -47,11 +97,8 @@ async def get_current_user(
     except JWTError:
         raise unauthorized_error("Invalid token")
     
-    # Fetch user from database
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.deleted_at == None
-    ).first()
+    # Fetch user (identity cached in Redis)
+    user = _load_active_user(db, user_id)
     
     if user is None:
         raise unauthorized_error("User not found")
@@ -104,6 +151,30 @@ async def require_superadmin(
     return current_user
 
 
+def require_self_or_admin(detail: str) -> Callable[..., User]:
+    """
+    Build a dependency restricting access to the user in the path or admins.
+    
+    The returned dependency reads the `user_id` path parameter and compares
+    it to the authenticated user's id as UUIDs.
+    
+    Args:
+        detail: Error message when access is denied
+        
+    Returns:
+        Dependency returning the current user
+    """
+    def dependency(
+        user_id: UUID,
+        current_user: User = Depends(get_current_user)
+    ) -> User:
+        if current_user.id != user_id and not current_user.is_admin:
+            raise forbidden_error(detail)
+        return current_user
+    
+    return dependency
+
+
 def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
     db: Session = Depends(get_db)
@@ -121,13 +192,44 @@ def get_optional_user(
         user_id = payload.get("sub")
         
         if user_id:
-            user = db.query(User).filter(
-                User.id == user_id,
-                User.deleted_at == None
-            ).first()
-            return user
+            return _load_active_user(db, user_id)
     except JWTError:
         pass
     
     return None
 
+
+
+# Request-scoped services bound to the request's database session
+
+def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
+    """Provide an AuthService bound to the request session."""
+    return AuthService(db)
+
+
+def get_tree_service(db: Session = Depends(get_db)) -> TreeService:
+    """Provide a TreeService bound to the request session."""
+    return TreeService(db)
+
+
+def get_prune_service(db: Session = Depends(get_db)) -> PruneService:
+    """Provide a PruneService bound to the request session."""
+    return PruneService(db)
+
+
+def get_stats_service(db: Session = Depends(get_db)) -> StatsService:
+    """Provide a StatsService bound to the request session."""
+    return StatsService(db)
+
+
+def get_invite_service(db: Session = Depends(get_db)) -> InviteService:
+    """Provide an InviteService bound to the request session."""
+    return InviteService(db)
+
+
+def get_health_service(
+    db: Session = Depends(get_db),
+    tree_service: TreeService = Depends(get_tree_service)
+) -> HealthService:
+    """Provide a HealthService sharing the request's TreeService."""
+    return HealthService(db, tree_service)
@@ -0,0 +1,37 @@
+"""
+Application logging.
+
+Handlers on the "app" logger only enqueue records; a background listener
+thread formats and writes them, so request threads never block on I/O.
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from app.config import settings
+
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def setup_logging() -> QueueListener:
+    """
+    Route "app" loggers through a queue drained by a listener thread.
+
+    Returns:
+        The started listener; stop it on shutdown to flush pending records
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+    app_logger.handlers = [QueueHandler(log_queue)]
+    app_logger.propagate = False
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
@@ -0,0 +1,87 @@
+"""
+Pure ASGI middleware (no BaseHTTPMiddleware task/Request wrapping).
+"""
+
+import time
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import start_query_count
+
+
+class TimingMiddleware:
+    """Add an X-Process-Time header with the time taken to start the response."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", str(time.perf_counter() - start_time))
+            await send(message)
+        
+        await self.app(scope, receive, send_with_timing)
+
+
+class QueryCountMiddleware:
+    """Add an X-Query-Count header with the number of SQL statements executed."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        counter = start_query_count()
+        
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Query-Count", str(counter.count))
+            await send(message)
+        
+        await self.app(scope, receive, send_with_count)
+
+
+class ProfilerMiddleware:
+    """
+    Return a pyinstrument call profile instead of the response for ?profile=1.
+    
+    Debug only; pyinstrument is an optional dependency imported on setup.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        from pyinstrument import Profiler
+        
+        self.app = app
+        self.profiler_class = Profiler
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not parse_qs(scope["query_string"].decode()).get("profile"):
+            await self.app(scope, receive, send)
+            return
+        
+        async def discard(message: Message) -> None:
+            pass
+        
+        profiler = self.profiler_class(async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+        
+        await HTMLResponse(profiler.output_html())(scope, receive, send)
@@ -0,0 +1,164 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque base64 strings encoding the (created_at, id) of the
+last row on a page, or just the id for tables whose id already follows
+insertion order. Seeking past the cursor keeps deep pages as cheap as
+the first one, unlike OFFSET which reads and discards skipped rows.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import tuple_, text
+from sqlalchemy.orm import Query, Session
+
+from app.core.exceptions import bad_request_error
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Encode a (created_at, id) pair as an opaque cursor string."""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, id_type: Callable[[str], Any] = str) -> Tuple[datetime, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+        id_type: Callable converting the id part (e.g. UUID, int)
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), id_type(row_id)
+    except ValueError:
+        raise bad_request_error("Invalid cursor")
+
+
+def paginate_keyset(
+    query: Query,
+    created_at_column,
+    id_column,
+    page_size: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    id_type: Callable[[str], Any] = str
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered by (created_at DESC, id DESC).
+
+    When a cursor is given the query seeks past it; otherwise the legacy
+    offset is applied. One extra row is fetched to detect a next page.
+
+    Args:
+        query: Filtered query to paginate
+        created_at_column: Timestamp column used for ordering
+        id_column: Unique tie-breaker column
+        page_size: Rows per page
+        cursor: Cursor from a previous page
+        offset: Rows to skip when no cursor is given
+        id_type: Callable converting the cursor id part
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    """
+    query = query.order_by(created_at_column.desc(), id_column.desc())
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, id_type)
+        query = query.filter(tuple_(created_at_column, id_column) < (created_at, row_id))
+    elif offset:
+        query = query.offset(offset)
+
+    rows = query.limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_at_column.key),
+            getattr(last, id_column.key)
+        )
+
+    return rows, next_cursor
+
+
+def paginate_by_id(
+    query: Query,
+    id_column,
+    page_size: int,
+    cursor: Optional[str] = None,
+    offset: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered by an auto-incrementing integer id DESC.
+
+    For append-only tables the id follows insertion time, so the primary
+    key index serves both the ordering and the seek.
+
+    Args:
+        query: Filtered query to paginate
+        id_column: Auto-incrementing primary key column
+        page_size: Rows per page
+        cursor: Cursor from a previous page
+        offset: Rows to skip when no cursor is given
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    """
+    query = query.order_by(id_column.desc())
+
+    if cursor:
+        try:
+            row_id = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except ValueError:
+            raise bad_request_error("Invalid cursor")
+        query = query.filter(id_column < row_id)
+    elif offset:
+        query = query.offset(offset)
+
+    rows = query.limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_id = getattr(rows[-1], id_column.key)
+        next_cursor = base64.urlsafe_b64encode(str(last_id).encode()).decode()
+
+    return rows, next_cursor
+
+
+def get_estimated_count(db: Session, table_name: str) -> Optional[int]:
+    """
+    Get the planner's row estimate for a table from pg_class.reltuples.
+
+    Much cheaper than COUNT(*) on large tables, at the cost of being as
+    stale as the last ANALYZE / autovacuum.
+
+    Args:
+        db: Database session
+        table_name: Name of the table
+
+    Returns:
+        Estimated row count, or None if the table was never analyzed
+    """
+    estimate = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name"),
+        {"table_name": table_name}
+    ).scalar()
+
+    if estimate is None or estimate < 0:
+        return None
+
+    return estimate
@@ -2,27 +2,102 @@
 Security utilities: password hashing, JWT token generation/validation.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from passlib.context import CryptContext
-from jose import jwt, JWTError
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
+from jose import jwk, jwt, JWTError, ExpiredSignatureError
+import base64
+import bcrypt
+import hashlib
+import hmac
+import json
 import secrets
+import time
 
 from app.config import settings
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt only uses the first 72 bytes of a password; longer input is cut
+# explicitly, matching how existing (passlib-created) hashes were made
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# JWT signing key, constructed once instead of on every encode/decode
+_jwt_key = jwk.construct(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding used by JWS."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Prebuilt HS256 header segment and key bytes for the fast encode path
+_HS256_HEADER_SEGMENT = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_HS256_KEY_BYTES = settings.JWT_SECRET_KEY.encode("utf-8")
+
+
+def _bcrypt_password(password: str) -> bytes:
+    """Encode a password for bcrypt, truncated to its 72-byte limit."""
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    """
+    Hash a password using bcrypt.
+    
+    bcrypt releases the GIL, so hashing in threadpool endpoints does not
+    block other requests.
+    """
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_bcrypt_password(password), salt).decode("ascii")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(_bcrypt_password(plain_password), hashed_password.encode("ascii"))
+    except ValueError:
+        # Malformed or non-bcrypt hash
+        return False
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """Hash of a random password, built on first use at the configured cost."""
+    return hash_password(secrets.token_urlsafe(32))
+
+
+def verify_dummy_password(plain_password: str) -> None:
+    """
+    Spend the same bcrypt work as a real check against a throwaway hash.
+    
+    Called when no account matches, so unknown emails take as long to
+    reject as wrong passwords and can't be enumerated by timing.
+    """
+    verify_password(plain_password, _dummy_password_hash())
+
+
+def _encode_token(payload: Dict[str, Any]) -> str:
+    """
+    Encode and sign a JWT.
+    
+    HS256 tokens are built directly (constant header, hmac/hashlib over
+    OpenSSL), producing the same compact form as jose; other algorithms
+    go through jose.
+    
+    Args:
+        payload: Claims, with `exp` as an integer Unix timestamp
+        
+    Returns:
+        Encoded JWT token string
+    """
+    if settings.JWT_ALGORITHM != "HS256":
+        return jwt.encode(payload, _jwt_key, algorithm=settings.JWT_ALGORITHM)
+    
+    claims_segment = _b64url(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    signing_input = _HS256_HEADER_SEGMENT + b"." + claims_segment
+    signature = hmac.new(_HS256_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
 
 
 def create_access_token(user_id: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -39,15 +114,13 @@ def create_access_token(user_id: str, expires_delta: Optional[timedelta] = None)
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    expire = datetime.utcnow() + expires_delta
-    
     payload = {
         "sub": str(user_id),
-        "exp": expire,
+        "exp": int(time.time()) + int(expires_delta.total_seconds()),
         "type": "access"
     }
     
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return _encode_token(payload)
 
 
 def create_refresh_token(user_id: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -64,21 +137,41 @@ def create_refresh_token(user_id: str, expires_delta: Optional[timedelta] = None
     if expires_delta is None:
         expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
-    expire = datetime.utcnow() + expires_delta
-    
     payload = {
         "sub": str(user_id),
-        "exp": expire,
+        "exp": int(time.time()) + int(expires_delta.total_seconds()),
         "type": "refresh"
     }
     
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return _encode_token(payload)
+
+
+def create_token_pair(user_id: str) -> Tuple[str, str]:
+    """
+    Create an access and refresh token for a user.
+    
+    Args:
+        user_id: User UUID as string
+        
+    Returns:
+        Tuple of (access_token, refresh_token)
+    """
+    return create_access_token(user_id), create_refresh_token(user_id)
+
+
+@lru_cache(maxsize=8192)
+def _decode_token(token: str) -> Dict[str, Any]:
+    """Decode and verify a token; valid results are memoized per token."""
+    return jwt.decode(token, _jwt_key, algorithms=[settings.JWT_ALGORITHM])
 
 
 def verify_token(token: str) -> Dict[str, Any]:
     """
     Verify and decode a JWT token.
     
+    Tokens are reused for many requests, so verified payloads are cached;
+    expiry is re-checked on every call so cached tokens still expire.
+    
     Args:
         token: JWT token string
         
@@ -88,7 +181,13 @@ def verify_token(token: str) -> Dict[str, Any]:
     Raises:
         JWTError: If token is invalid or expired
     """
-    return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    payload = _decode_token(token)
+    
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        raise ExpiredSignatureError("Signature has expired.")
+    
+    return dict(payload)
 
 
 def generate_secure_token(length: int = 64) -> str:
@@ -105,3 +204,16 @@ def generate_secure_token(length: int = 64) -> str:
     """
     return secrets.token_urlsafe(length)[:length]
 
+
+def hash_invite_token(token: str) -> bytes:
+    """
+    SHA-256 digest of an invite token, as stored in InviteToken.token_hash.
+    
+    Args:
+        token: Invite token string
+        
+    Returns:
+        32-byte digest
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
@@ -2,10 +2,11 @@
 Database connection and session management.
 """
 
-from sqlalchemy import create_engine
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Generator, Optional
 
 from app.config import settings
 
@@ -13,25 +14,81 @@ from app.config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,  # Drop connections before server/proxy timeouts
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,  # Fail fast when the pool is exhausted
     echo=settings.DEBUG  # Log SQL queries in debug mode
 )
 
+
+class QueryCounter:
+    """Mutable count of SQL statements executed within one request."""
+    
+    def __init__(self):
+        self.count = 0
+
+
+# Counter for the current request; None outside of counted requests
+_query_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def start_query_count() -> QueryCounter:
+    """
+    Start counting SQL statements for the current context.
+    
+    The counter is shared by reference, so statements issued from tasks or
+    threadpool workers spawned afterwards are counted too.
+    
+    Returns:
+        QueryCounter updated as statements execute
+    """
+    counter = QueryCounter()
+    _query_counter.set(counter)
+    return counter
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Increment the current request's query counter, if any."""
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
+# PostgreSQL extensions the schema depends on (trigram indexes, citext emails)
+REQUIRED_EXTENSIONS = ("pg_trgm", "citext")
+
+
+def create_extensions(connection) -> None:
+    """Create required PostgreSQL extensions if they don't exist."""
+    for extension in REQUIRED_EXTENSIONS:
+        connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+
+
+@event.listens_for(Base.metadata, "before_create")
+def _create_extensions_before_tables(target, connection, **kw):
+    """Ensure extensions exist before create_all() builds tables and indexes."""
+    create_extensions(connection)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
     Database session dependency for FastAPI.
     
+    The session is synchronous, so endpoints using it are declared with
+    plain `def` and run in FastAPI's threadpool instead of blocking the
+    event loop.
+    
     Usage:
         @app.get("/users")
-        async def get_users(db: Session = Depends(get_db)):
+        def get_users(db: Session = Depends(get_db)):
             return db.query(User).all()
     """
     db = SessionLocal()
@@ -4,13 +4,17 @@ FastAPI application entry point.
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
+import logging
 import time
 
 from app.config import settings
 from app.database import engine, Base
 from app.api import auth, invites, users, admin
+from app.core.middleware import TimingMiddleware, QueryCountMiddleware, ProfilerMiddleware
+from app.core.log_setup import setup_logging
 from app.core.exceptions import (
     InviteTreeException,
     InsufficientQuotaException,
@@ -18,6 +22,8 @@ from app.core.exceptions import (
     UnauthorizedException
 )
 
+logger = logging.getLogger(__name__)
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -25,7 +31,8 @@ app = FastAPI(
     description="Forensic-first invite tree system for tracking and pruning malicious networks",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -37,16 +44,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (tree and admin listings)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to responses."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+app.add_middleware(TimingMiddleware)
+
+# Debug only: query counts to spot N+1 regressions, and a per-request
+# call profile with ?profile=1 (needs pyinstrument)
+if settings.DEBUG:
+    app.add_middleware(QueryCountMiddleware)
+    app.add_middleware(ProfilerMiddleware)
 
 
 # Exception handlers
@@ -130,21 +139,24 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
+    app.state.log_listener = setup_logging()
+    
     # In development, you can auto-create tables
     # In production, use Alembic migrations
     if settings.DEBUG:
-        print("⚠️  Running in DEBUG mode - auto-creating tables")
+        logger.warning("Running in DEBUG mode - auto-creating tables")
         Base.metadata.create_all(bind=engine)
     
-    print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} started")
-    print(f"📚 API Documentation: http://localhost:8000/docs")
+    logger.info("%s v%s started", settings.APP_NAME, settings.APP_VERSION)
+    logger.info("API Documentation: http://localhost:8000/docs")
 
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    print(f"👋 {settings.APP_NAME} shutting down")
+    logger.info("%s shutting down", settings.APP_NAME)
+    app.state.log_listener.stop()
 
 
 if __name__ == "__main__":
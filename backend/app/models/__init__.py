@@ -7,12 +7,14 @@ from app.models.invite_token import InviteToken
 from app.models.audit_log import InviteAuditLog
 from app.models.health_score import UserHealthScore
 from app.models.prune_operation import PruneOperation
+from app.models.prune_affected_user import PruneAffectedUser
 
 __all__ = [
     "User",
     "InviteToken",
     "InviteAuditLog",
     "UserHealthScore",
-    "PruneOperation"
+    "PruneOperation",
+    "PruneAffectedUser"
 ]
 
@@ -2,7 +2,7 @@
 Audit Log model - Immutable event log for forensic analysis.
 """
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, BigInteger
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, BigInteger, Index, text
 from sqlalchemy.dialects.postgresql import UUID, INET, JSONB
 from sqlalchemy.sql import func
 
@@ -25,6 +25,18 @@ class InviteAuditLog(Base):
     """
     
     __tablename__ = "invite_audit_log"
+    __table_args__ = (
+        # Audit log filtered by event type, newest first (id follows insertion order)
+        Index("idx_audit_event_id", "event_type", text("id DESC")),
+        # Time-window scans; rows are appended in created_at order, so a
+        # block-range index is a fraction of the size of a btree
+        Index(
+            "ix_audit_created_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32}
+        ),
+    )
     
     # Primary key (auto-incrementing for chronological ordering)
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -41,7 +53,7 @@ class InviteAuditLog(Base):
     event_data = Column(JSONB, nullable=False, default=dict)
     
     # Timestamp (immutable)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Forensic context
     ip_address = Column(INET, nullable=True)
@@ -2,7 +2,7 @@
 User Health Score model - Calculated periodically to assess invite tree quality.
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Numeric, BigInteger
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Numeric, BigInteger, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -20,12 +20,24 @@ class UserHealthScore(Base):
     """
     
     __tablename__ = "user_health_scores"
+    __table_args__ = (
+        # Latest score per user (ORDER BY calculated_at DESC LIMIT 1); also
+        # serves plain user_id lookups
+        Index("idx_health_user_calculated", "user_id", text("calculated_at DESC")),
+        # Recent-score range scans; snapshots are appended in calculated_at order
+        Index(
+            "ix_health_calculated_brin",
+            "calculated_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32}
+        ),
+    )
     
     # Primary key
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     
     # User reference
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
     # Subtree statistics
     subtree_size = Column(Integer, default=0)
@@ -36,7 +48,7 @@ class UserHealthScore(Base):
     # Health scores (0-100)
     direct_invitee_health = Column(Numeric(5, 2), default=100.0)
     subtree_health = Column(Numeric(5, 2), default=100.0)
-    overall_health = Column(Numeric(5, 2), default=100.0, index=True)
+    overall_health = Column(Numeric(5, 2), default=100.0)
     
     # Tree metrics
     max_depth_below = Column(Integer, default=0)
@@ -45,7 +57,7 @@ class UserHealthScore(Base):
     maturity_level = Column(String(20), default="branch")  # branch, supporting_trunk, core
     
     # Calculation timestamp
-    calculated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    calculated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     def __repr__(self):
         return f"<UserHealthScore(user_id={self.user_id}, overall_health={self.overall_health}, calculated_at={self.calculated_at})>"
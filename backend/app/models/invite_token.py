@@ -2,12 +2,13 @@
 Invite Token model - Represents a single-use invite code.
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Computed, String, DateTime, ForeignKey, LargeBinary, Text, Index, and_, text
 from sqlalchemy.dialects.postgresql import UUID, INET
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.database import Base
 
@@ -24,25 +25,40 @@ class InviteToken(Base):
     """
     
     __tablename__ = "invite_tokens"
+    __table_args__ = (
+        # Live (unused, unrevoked) tokens by expiry, for the expiry sweep
+        Index(
+            "ix_tokens_live_expires",
+            "expires_at",
+            postgresql_where=text("used_at IS NULL AND revoked_at IS NULL")
+        ),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # The actual token string (64 chars, cryptographically secure)
-    token = Column(String(64), unique=True, nullable=False, index=True)
+    token = Column(String(64), nullable=False)
+    
+    # SHA-256 of the token, maintained by PostgreSQL; lookups go through its
+    # fixed-width 32-byte index instead of one on the token text
+    token_hash = Column(
+        LargeBinary,
+        Computed("sha256(CAST(token AS bytea))", persisted=True),
+        unique=True,
+        nullable=False
+    )
     
     # Ownership
     created_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     # Usage
     used_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
-    is_used = Column(Boolean, default=False, index=True)
     
     # Expiration
-    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
     
-    # Revocation
-    is_revoked = Column(Boolean, default=False, index=True)
+    # Revocation (revoked_at is set on revoke and on auto-expiry)
     revoked_at = Column(DateTime(timezone=True), nullable=True)
     revoked_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     revoked_reason = Column(Text, nullable=True)
@@ -58,25 +74,51 @@ class InviteToken(Base):
     # Optional note from creator
     note = Column(Text, nullable=True)
     
-    # Relationships
-    creator = relationship("User", foreign_keys=[created_by_user_id], back_populates="created_tokens")
-    used_by_user = relationship("User", foreign_keys=[used_by_user_id], back_populates="used_token")
+    # Relationships (raise on lazy load, like the User tree links)
+    creator = relationship(
+        "User", foreign_keys=[created_by_user_id], back_populates="created_tokens", lazy="raise_on_sql"
+    )
+    used_by_user = relationship(
+        "User", foreign_keys=[used_by_user_id], back_populates="used_token", lazy="raise_on_sql"
+    )
     
     def __repr__(self):
         return f"<InviteToken(id={self.id}, token={self.token[:8]}..., is_used={self.is_used})>"
     
-    @property
+    @hybrid_property
+    def is_used(self) -> bool:
+        """Token has been redeemed (used_at is set)."""
+        return self.used_at is not None
+    
+    @is_used.expression
+    def is_used(cls):
+        return cls.used_at.isnot(None)
+    
+    @hybrid_property
+    def is_revoked(self) -> bool:
+        """Token has been revoked or auto-expired (revoked_at is set)."""
+        return self.revoked_at is not None
+    
+    @is_revoked.expression
+    def is_revoked(cls):
+        return cls.revoked_at.isnot(None)
+    
+    @hybrid_property
     def is_valid(self) -> bool:
         """Check if token is valid for use."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         return (
-            not self.is_used
-            and not self.is_revoked
+            self.used_at is None
+            and self.revoked_at is None
             and self.expires_at > now
         )
     
+    @is_valid.expression
+    def is_valid(cls):
+        return and_(cls.used_at.is_(None), cls.revoked_at.is_(None), cls.expires_at > func.now())
+    
     @property
     def is_expired(self) -> bool:
         """Check if token has expired."""
-        return datetime.utcnow() > self.expires_at
+        return datetime.now(timezone.utc) > self.expires_at
 
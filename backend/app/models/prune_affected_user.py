@@ -0,0 +1,29 @@
+"""
+Prune Affected User model - Per-user snapshot rows of a prune operation.
+"""
+
+from sqlalchemy import Column, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+from app.database import Base
+
+
+class PruneAffectedUser(Base):
+    """
+    Snapshot of one user removed by a prune operation.
+    
+    Written in bulk when the prune runs (one row per affected user) and
+    read back by operation on rollback.
+    """
+    
+    __tablename__ = "prune_affected_users"
+    
+    # Composite primary key (operation first, for per-operation reads)
+    operation_id = Column(UUID(as_uuid=True), ForeignKey("prune_operations.id"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    
+    # User as it was just before the prune (id, username, email, status, depth, ...)
+    snapshot = Column(JSONB, nullable=False)
+    
+    def __repr__(self):
+        return f"<PruneAffectedUser(operation_id={self.operation_id}, user_id={self.user_id})>"
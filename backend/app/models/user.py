@@ -2,8 +2,8 @@
 User model - Core entity in the invite tree system.
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID, INET
+from sqlalchemy import CheckConstraint, Column, Computed, String, Integer, Boolean, DateTime, ForeignKey, Text, Index, event, select, text
+from sqlalchemy.dialects.postgresql import UUID, INET, ARRAY, CITEXT, ENUM
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -11,6 +11,10 @@ import uuid
 from app.database import Base
 
 
+# Native enum types: fixed 4-byte values instead of varchar text
+USER_STATUS = ENUM("active", "suspended", "banned", "flagged", name="user_status")
+USER_ROLE = ENUM("user", "admin", "superadmin", name="user_role")
+
 class User(Base):
     """
     User model representing a node in the invite tree.
@@ -20,31 +24,85 @@ class User(Base):
     """
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Same rule as RegisterRequest.username, enforced for every writer
+        CheckConstraint("username ~ '^[A-Za-z0-9_-]+$'", name="ck_users_username_chars"),
+        # Admin listing filters and dashboard counts: live users by status, newest first
+        Index("idx_users_status_deleted", "status", postgresql_where=text("deleted_at IS NULL")),
+        Index(
+            "idx_users_created_active",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        # Registration time windows; created_at follows insertion order,
+        # so a block-range index stays tiny
+        Index(
+            "idx_users_created_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32}
+        ),
+        # Substring search on username/email (ILIKE '%term%') via pg_trgm
+        Index(
+            "idx_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"}
+        ),
+        Index(
+            "idx_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"}
+        ),
+        # Live direct invitees of a user, newest first; roots (NULL inviter)
+        # and pruned users are left out of the index
+        Index(
+            "idx_users_invited_by_active",
+            "invited_by_user_id",
+            text("created_at DESC"),
+            postgresql_where=text("invited_by_user_id IS NOT NULL AND deleted_at IS NULL")
+        ),
+        # Subtree membership (tree_path @> ARRAY[root]) without a recursive walk
+        Index("idx_users_tree_path", "tree_path", postgresql_using="gin"),
+        # Users who can still invite
+        Index("idx_users_has_invites", "invites_available", postgresql_where=text("invites_available > 0")),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
     # Authentication
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    # Case-insensitive text: lookups and the unique index ignore case
+    email = Column(CITEXT, unique=True, nullable=False, index=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     
     # User type & role
     is_core_member = Column(Boolean, default=False)
-    role = Column(String(20), default="user")  # user, admin, superadmin
+    role = Column(USER_ROLE, nullable=False, default="user", server_default="user")
     
     # Invite capacity
     invite_quota = Column(Integer, default=0)
     invites_used = Column(Integer, default=0)
+    # Maintained by PostgreSQL; the ORM re-reads it after quota changes flush
+    invites_available = Column(Integer, Computed("GREATEST(0, invite_quota - invites_used)", persisted=True))
     
     # Tree relationship - THE CRITICAL FIELD
-    invited_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
+    invited_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    
+    # Materialized path: ids from the tree root down to this user (inclusive),
+    # and the user's depth below the root. Set on insert by _set_tree_path;
+    # users are never re-parented, so they stay valid.
+    tree_path = Column(ARRAY(UUID(as_uuid=True)), nullable=False, server_default=text("'{}'"))
+    depth = Column(Integer, nullable=False, default=0, server_default=text("0"))
     
     # Status
-    status = Column(String(20), default="active", index=True)  # active, suspended, banned, flagged
+    status = Column(USER_STATUS, nullable=False, default="active", server_default="active")
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_login_at = Column(DateTime(timezone=True), nullable=True)
     
@@ -54,22 +112,28 @@ class User(Base):
     registration_fingerprint = Column(String(255), nullable=True)
     
     # Soft delete
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
     deleted_reason = Column(Text, nullable=True)
     
     # Relationships
-    invited_by = relationship("User", remote_side=[id], backref="invited_users")
-    created_tokens = relationship("InviteToken", foreign_keys="InviteToken.created_by_user_id", back_populates="creator")
-    used_token = relationship("InviteToken", foreign_keys="InviteToken.used_by_user_id", back_populates="used_by_user", uselist=False)
+    # Tree links raise instead of lazy loading; eager-load them explicitly
+    # (joinedload / selectinload) or use the recursive CTEs in TreeService
+    invited_by = relationship("User", remote_side=[id], back_populates="invited_users", lazy="raise_on_sql")
+    invited_users = relationship("User", back_populates="invited_by", lazy="raise_on_sql")
+    created_tokens = relationship(
+        "InviteToken", foreign_keys="InviteToken.created_by_user_id", back_populates="creator", lazy="raise_on_sql"
+    )
+    used_token = relationship(
+        "InviteToken",
+        foreign_keys="InviteToken.used_by_user_id",
+        back_populates="used_by_user",
+        uselist=False,
+        lazy="raise_on_sql"
+    )
     
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', status='{self.status}')>"
     
-    @property
-    def invites_available(self) -> int:
-        """Calculate remaining invite quota."""
-        return max(0, self.invite_quota - self.invites_used)
-    
     @property
     def is_deleted(self) -> bool:
         """Check if user is soft-deleted."""
@@ -80,3 +144,21 @@ class User(Base):
         """Check if user has admin privileges."""
         return self.role in ["admin", "superadmin"]
 
+
+
+@event.listens_for(User, "before_insert")
+def _set_tree_path(mapper, connection, target):
+    """Derive a new user's tree_path and depth from its inviter's."""
+    if target.id is None:
+        target.id = uuid.uuid4()
+    
+    if target.invited_by_user_id is None:
+        target.tree_path = [target.id]
+        target.depth = 0
+        return
+    
+    inviter = connection.execute(
+        select(User.tree_path, User.depth).where(User.id == target.invited_by_user_id)
+    ).one()
+    target.tree_path = list(inviter.tree_path) + [target.id]
+    target.depth = inviter.depth + 1
@@ -5,6 +5,7 @@ Admin schemas for API requests and responses.
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from uuid import UUID
 
 
 class AdminStatsResponse(BaseModel):
@@ -21,6 +22,34 @@ class AdminStatsResponse(BaseModel):
     low_health_users: int
 
 
+class AdminUserListItem(BaseModel):
+    """User row in the admin user listing."""
+    id: UUID
+    username: str
+    email: str
+    status: str
+    role: str
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class PaginationInfo(BaseModel):
+    """Pagination metadata for list responses."""
+    page: Optional[int] = None
+    page_size: int
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class AdminUserListResponse(BaseModel):
+    """Response schema for the admin user listing."""
+    users: List[AdminUserListItem]
+    pagination: PaginationInfo
+
+
 class UserFlagRequest(BaseModel):
     """Request schema for flagging a user."""
     reason: str = Field(..., min_length=10, max_length=1000)
@@ -36,7 +65,7 @@ class UserFlagResponse(BaseModel):
 
 class PruneRequest(BaseModel):
     """Request schema for pruning a branch."""
-    root_user_id: str
+    root_user_id: UUID
     reason: str = Field(..., min_length=20, max_length=2000)
     dry_run: bool = False
 
@@ -81,7 +110,8 @@ class PruneHistoryItem(BaseModel):
 class PruneHistoryResponse(BaseModel):
     """Response schema for prune history."""
     operations: List[PruneHistoryItem]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class AuditLogEntry(BaseModel):
@@ -101,9 +131,10 @@ class AuditLogEntry(BaseModel):
 class AuditLogResponse(BaseModel):
     """Response schema for audit log."""
     entries: List[AuditLogEntry]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class UserDetailedResponse(BaseModel):
@@ -136,7 +167,7 @@ class UserDetailedResponse(BaseModel):
 
 class QuotaAdjustRequest(BaseModel):
     """Request schema for adjusting user quota."""
-    user_id: str
+    user_id: UUID
     new_quota: int = Field(..., ge=0, le=1000)
     reason: str = Field(..., min_length=10, max_length=500)
 
@@ -2,24 +2,20 @@
 Authentication schemas for API requests and responses.
 """
 
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
+from datetime import datetime
+from uuid import UUID
 
 
 class RegisterRequest(BaseModel):
     """Request schema for user registration."""
     email: EmailStr
+    # Alphanumeric with _ or -, checked by pydantic-core's regex
     username: str = Field(..., min_length=3, max_length=50, pattern="^[a-zA-Z0-9_-]+$")
     password: str = Field(..., min_length=8)
     invite_token: str = Field(..., min_length=10)
     fingerprint: Optional[str] = None
-    
-    @validator("username")
-    def username_alphanumeric(cls, v):
-        """Ensure username contains only valid characters."""
-        if not v.replace("_", "").replace("-", "").isalnum():
-            raise ValueError("Username must be alphanumeric (with _ or - allowed)")
-        return v
 
 
 class LoginRequest(BaseModel):
@@ -51,7 +47,7 @@ class RefreshResponse(BaseModel):
 
 class UserMeResponse(BaseModel):
     """Response schema for /auth/me endpoint."""
-    id: str
+    id: UUID
     username: str
     email: str
     role: str
@@ -60,7 +56,7 @@ class UserMeResponse(BaseModel):
     invites_used: int
     invites_available: int
     status: str
-    created_at: str
+    created_at: datetime
     
     class Config:
         from_attributes = True
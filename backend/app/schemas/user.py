@@ -5,11 +5,12 @@ User and tree schemas for API requests and responses.
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+from uuid import UUID
 
 
 class UserPublicProfile(BaseModel):
     """Public user profile (limited information)."""
-    id: str
+    id: UUID
     username: str
     created_at: datetime
     status: str
@@ -47,10 +48,6 @@ class TreeNode(BaseModel):
         from_attributes = True
 
 
-# Enable forward reference for recursive model
-TreeNode.model_rebuild()
-
-
 class UserTreeResponse(BaseModel):
     """Response schema for user's invite tree."""
     root_user_id: str
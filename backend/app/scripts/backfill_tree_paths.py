@@ -0,0 +1,56 @@
+"""
+Script to backfill users.tree_path and users.depth from invited_by_user_id.
+
+New users get both on insert, and the migration adding the columns
+(39484748211a) backfills existing rows. Re-run this if paths ever need
+recomputing, e.g. after editing invited_by_user_id by hand.
+"""
+
+import sys
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+
+
+BACKFILL_QUERY = text("""
+WITH RECURSIVE paths AS (
+    SELECT id, ARRAY[id] AS tree_path, 0 AS depth
+    FROM users
+    WHERE invited_by_user_id IS NULL
+
+    UNION ALL
+
+    SELECT u.id, p.tree_path || u.id, p.depth + 1
+    FROM users u
+    INNER JOIN paths p ON u.invited_by_user_id = p.id
+)
+UPDATE users
+SET tree_path = paths.tree_path,
+    depth = paths.depth
+FROM paths
+WHERE users.id = paths.id
+  AND users.tree_path IS DISTINCT FROM paths.tree_path;
+""")
+
+
+def backfill_tree_paths():
+    """Recompute every user's materialized tree path."""
+    db = SessionLocal()
+    
+    try:
+        result = db.execute(BACKFILL_QUERY)
+        db.commit()
+        print(f"✅ Backfilled tree paths for {result.rowcount} users")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error backfilling tree paths: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("🔧 Backfilling invite tree paths...")
+    backfill_tree_paths()
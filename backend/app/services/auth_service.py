@@ -2,19 +2,68 @@
 Authentication service - handles user registration, login, and token management.
 """
 
-from datetime import datetime, timedelta
 from typing import Optional, Tuple
+from uuid import uuid4
+from sqlalchemy import Row, bindparam, func, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from jose import JWTError
 
 from app.models.user import User
 from app.models.invite_token import InviteToken
-from app.models.audit_log import InviteAuditLog
-from app.core.security import hash_password, verify_password, create_access_token, create_refresh_token
+from app.core.security import hash_password, hash_invite_token, verify_password, verify_dummy_password, create_access_token, create_token_pair, verify_token
 from app.core.exceptions import InvalidInviteTokenException, bad_request_error, unauthorized_error
 from app.config import settings
 
 
+# Registration as one statement: claim the invite token (only if it is
+# still unused, unrevoked and unexpired), insert the user under its
+# inviter (tree_path/depth as in User's before_insert hook) and write the
+# audit entry. Claiming in the UPDATE closes the race where two requests
+# validate the same token before either marks it used.
+_REGISTER_USER_QUERY = text("""
+WITH claimed AS (
+    UPDATE invite_tokens
+    SET used_by_user_id = CAST(:user_id AS uuid),
+        used_at = now(),
+        used_ip = CAST(:registration_ip AS inet),
+        used_user_agent = :registration_user_agent
+    WHERE token_hash = :token_hash
+      AND used_at IS NULL
+      AND revoked_at IS NULL
+      AND expires_at > now()
+    RETURNING id, created_by_user_id
+),
+new_user AS (
+    INSERT INTO users (
+        id, email, username, password_hash, is_core_member, role,
+        invite_quota, invites_used, invited_by_user_id, tree_path, depth,
+        status, registration_ip, registration_user_agent, registration_fingerprint
+    )
+    SELECT
+        CAST(:user_id AS uuid), :email, :username, :password_hash, false, 'user',
+        :invite_quota, 0, c.created_by_user_id,
+        inviter.tree_path || CAST(:user_id AS uuid), inviter.depth + 1,
+        'active', CAST(:registration_ip AS inet), :registration_user_agent, :registration_fingerprint
+    FROM claimed c
+    INNER JOIN users inviter ON inviter.id = c.created_by_user_id
+    RETURNING id
+),
+audit AS (
+    INSERT INTO invite_audit_log (
+        event_type, actor_user_id, target_user_id, invite_token_id,
+        event_data, ip_address, user_agent
+    )
+    SELECT
+        'token_used', n.id, c.created_by_user_id, c.id,
+        CAST(:event_data AS jsonb), CAST(:registration_ip AS inet), :registration_user_agent
+    FROM claimed c, new_user n
+)
+SELECT id FROM new_user;
+""").bindparams(bindparam("event_data", type_=JSONB))
+
+
 class AuthService:
     """Service for authentication operations."""
     
@@ -49,107 +98,99 @@ class AuthService:
         Raises:
             HTTPException: If validation fails
         """
-        # Check if email already exists
-        if self.db.query(User).filter(User.email == email).first():
+        # Check email and username uniqueness in one round-trip (EXISTS
+        # stops at the first index match without loading a row)
+        email_taken, username_taken = self.db.query(
+            self.db.query(User).filter(User.email == email).exists(),
+            self.db.query(User).filter(User.username == username).exists()
+        ).one()
+        
+        if email_taken:
             raise bad_request_error("Email already registered")
         
-        # Check if username already exists
-        if self.db.query(User).filter(User.username == username).first():
+        if username_taken:
             raise bad_request_error("Username already taken")
         
-        # Validate invite token
-        invite_token = self.db.query(InviteToken).filter(
-            InviteToken.token == invite_token_str
-        ).first()
-        
-        if not invite_token:
-            raise bad_request_error("Invalid invite token")
-        
-        if not invite_token.is_valid:
-            if invite_token.is_used:
-                reason = "Invite token has already been used"
-            elif invite_token.is_revoked:
-                reason = "Invite token has been revoked"
-            elif invite_token.is_expired:
-                reason = "Invite token has expired"
-            else:
-                reason = "Invite token is invalid"
-            raise bad_request_error(reason)
-        
-        # Create user
-        user = User(
-            email=email,
-            username=username,
-            password_hash=hash_password(password),
-            invited_by_user_id=invite_token.created_by_user_id,
-            invite_quota=settings.DEFAULT_INVITE_QUOTA,
-            registration_ip=registration_ip,
-            registration_user_agent=registration_user_agent,
-            registration_fingerprint=registration_fingerprint,
-            status="active"
-        )
-        
-        self.db.add(user)
-        self.db.flush()  # Get user.id without committing
-        
-        # Mark token as used
-        invite_token.is_used = True
-        invite_token.used_by_user_id = user.id
-        invite_token.used_at = datetime.utcnow()
-        invite_token.used_ip = registration_ip
-        invite_token.used_user_agent = registration_user_agent
-        
-        # Log to audit
-        audit_entry = InviteAuditLog(
-            event_type="token_used",
-            actor_user_id=user.id,
-            target_user_id=invite_token.created_by_user_id,
-            invite_token_id=invite_token.id,
-            event_data={
+        # Claim the token, create the user and audit it in one round-trip
+        user_id = uuid4()
+        created = self.db.execute(_REGISTER_USER_QUERY, {
+            "user_id": str(user_id),
+            "email": email,
+            "username": username,
+            "password_hash": hash_password(password),
+            "invite_quota": settings.DEFAULT_INVITE_QUOTA,
+            "token_hash": hash_invite_token(invite_token_str),
+            "registration_ip": registration_ip,
+            "registration_user_agent": registration_user_agent,
+            "registration_fingerprint": registration_fingerprint,
+            "event_data": {
                 "new_user_email": email,
                 "new_user_username": username,
                 "token": invite_token_str[:8] + "..."
-            },
-            ip_address=registration_ip,
-            user_agent=registration_user_agent
-        )
-        self.db.add(audit_entry)
+            }
+        }).first()
+        
+        if created is None:
+            self.db.rollback()
+            raise bad_request_error(self._invalid_token_reason(invite_token_str))
         
-        # Commit transaction
         self.db.commit()
-        self.db.refresh(user)
         
-        return user
+        return self.db.get(User, user_id)
     
-    def authenticate_user(self, email: str, password: str) -> Optional[User]:
+    def _invalid_token_reason(self, invite_token_str: str) -> str:
+        """Explain why an invite token could not be claimed."""
+        invite_token = self.db.query(InviteToken).filter(
+            InviteToken.token_hash == hash_invite_token(invite_token_str)
+        ).first()
+        
+        if not invite_token:
+            return "Invalid invite token"
+        if invite_token.is_used:
+            return "Invite token has already been used"
+        if invite_token.is_revoked:
+            return "Invite token has been revoked"
+        if invite_token.is_expired:
+            return "Invite token has expired"
+        return "Invite token is invalid"
+    
+    def authenticate_user(self, email: str, password: str) -> Optional[Row]:
         """
         Authenticate user by email and password.
         
+        Only the columns login needs are read; no User object is built.
+        
         Args:
             email: User's email
             password: Plain text password
             
         Returns:
-            User object if authentication successful, None otherwise
+            Row with id, username, email and status if authentication
+            successful, None otherwise
         """
-        user = self.db.query(User).filter(
-            User.email == email,
-            User.deleted_at == None
+        user = self.db.execute(
+            select(User.id, User.username, User.email, User.status, User.password_hash).where(
+                User.email == email,
+                User.deleted_at == None
+            )
         ).first()
         
         if not user:
+            verify_dummy_password(password)
             return None
         
         if not verify_password(password, user.password_hash):
             return None
         
-        # Update last login
-        user.last_login_at = datetime.utcnow()
+        # Update last login (database clock)
+        self.db.execute(
+            update(User).where(User.id == user.id).values(last_login_at=func.now())
+        )
         self.db.commit()
         
         return user
     
-    def login(self, email: str, password: str) -> Tuple[User, str, str]:
+    def login(self, email: str, password: str) -> Tuple[Row, str, str]:
         """
         Login user and generate tokens.
         
@@ -158,7 +199,7 @@ class AuthService:
             password: Plain text password
             
         Returns:
-            Tuple of (User, access_token, refresh_token)
+            Tuple of (user row, access_token, refresh_token)
             
         Raises:
             HTTPException: If authentication fails
@@ -172,8 +213,7 @@ class AuthService:
             raise bad_request_error(f"Account is {user.status}")
         
         # Generate tokens
-        access_token = create_access_token(str(user.id))
-        refresh_token = create_refresh_token(str(user.id))
+        access_token, refresh_token = create_token_pair(str(user.id))
         
         return user, access_token, refresh_token
     
@@ -190,14 +230,8 @@ class AuthService:
         Raises:
             HTTPException: If refresh token is invalid
         """
-        from jose import jwt, JWTError
-        
         try:
-            payload = jwt.decode(
-                refresh_token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = verify_token(refresh_token)
             
             user_id = payload.get("sub")
             token_type = payload.get("type")
@@ -205,13 +239,13 @@ class AuthService:
             if user_id is None or token_type != "refresh":
                 raise unauthorized_error("Invalid refresh token")
             
-            # Verify user still exists and is active
-            user = self.db.query(User).filter(
+            # Verify user still exists and is active (status only, no full row)
+            user_status = self.db.query(User.status).filter(
                 User.id == user_id,
                 User.deleted_at == None
-            ).first()
+            ).scalar()
             
-            if not user or user.status != "active":
+            if user_status != "active":
                 raise unauthorized_error("Invalid refresh token")
             
             # Generate new access token
@@ -2,23 +2,32 @@
 Health score service - calculates and manages user health scores.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, Sequence
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.models.user import User
 from app.models.health_score import UserHealthScore
 from app.services.tree_service import TreeService
+from app.core.cache import invalidate_cached_users
 from app.config import settings
 
 
+logger = logging.getLogger(__name__)
+
+# Score rows inserted per transaction in the daily batch
+HEALTH_SCORE_BATCH_SIZE = 500
+
+
 class HealthService:
     """Service for calculating user health scores."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, tree_service: Optional[TreeService] = None):
         self.db = db
-        self.tree_service = TreeService(db)
+        self.tree_service = tree_service or TreeService(db)
     
     def calculate_health_score(self, user_id: UUID) -> float:
         """
@@ -36,41 +45,83 @@ class HealthService:
         Returns:
             Health score (0-100)
         """
-        descendants = self.tree_service.get_descendants(user_id, max_depth=None)
+        stats = self.tree_service.get_subtree_stats(user_id)
+        status = self.db.query(User.status).filter(User.id == user_id).scalar()
         
-        if len(descendants) <= 1:  # Only the user themselves
+        return self._health_from_stats(status, stats)
+    
+    def _health_from_stats(self, status: str, stats: Dict[str, Any]) -> float:
+        """
+        Calculate a health score from aggregated subtree statistics.
+        
+        The level and status counts come from SQL; only the weighting and
+        clamping happen here. The user's own status counts toward the
+        penalties too.
+        
+        Args:
+            status: The user's own status
+            stats: Result of TreeService.get_subtree_stats (or an entry of
+                get_all_subtree_stats)
+            
+        Returns:
+            Health score (0-100)
+        """
+        if stats["total_descendants"] == 0:
             return 100.0
         
-        # Separate by depth level
-        level1 = [d for d in descendants if d["depth"] == 1]
-        level2 = [d for d in descendants if d["depth"] == 2]
-        level3_plus = [d for d in descendants if d["depth"] >= 3]
+        return self._weighted_health(
+            [
+                (stats["direct_invites"], stats["level1_active"]),
+                (stats["level2_total"], stats["level2_active"]),
+                (stats["level3_total"], stats["level3_active"]),
+            ],
+            stats["flagged_count"] + (status == "flagged"),
+            stats["banned_count"] + (status == "banned")
+        )
+    
+    @staticmethod
+    def _weighted_health(
+        levels: Sequence[Sequence[int]],
+        flagged_count: int,
+        banned_count: int
+    ) -> float:
+        """
+        Combine per-level health and penalties into a score.
         
-        # Calculate health for each level
-        def level_health(users):
-            if not users:
+        Args:
+            levels: (total, active) counts for level 1, level 2 and level 3+
+            flagged_count: Flagged users in the subtree
+            banned_count: Banned users in the subtree
+            
+        Returns:
+            Health score (0-100)
+        """
+        def level_health(total, active):
+            if not total:
                 return 100.0
-            active = sum(1 for u in users if u["status"] == "active")
-            return (active / len(users)) * 100
+            return (active / total) * 100
         
-        level1_health = level_health(level1)
-        level2_health = level_health(level2)
-        level3_health = level_health(level3_plus)
+        level1_health, level2_health, level3_health = (
+            level_health(total, active) for total, active in levels
+        )
         
         # Weighted average
         overall = (level1_health * 0.5) + (level2_health * 0.3) + (level3_health * 0.2)
         
         # Apply penalties
-        flagged_count = sum(1 for d in descendants if d["status"] == "flagged")
-        banned_count = sum(1 for d in descendants if d["status"] == "banned")
-        
         penalty = (flagged_count * 10) + (banned_count * 25)
         
         final_score = max(0.0, min(100.0, overall - penalty))
         
         return round(final_score, 2)
     
-    def determine_maturity_level(self, user: User, health_score: float) -> str:
+    def determine_maturity_level(
+        self,
+        user: User,
+        health_score: float,
+        stats: Optional[Dict[str, Any]] = None,
+        now: Optional[datetime] = None
+    ) -> str:
         """
         Determine user's maturity level.
         
@@ -80,8 +131,11 @@ class HealthService:
         - branch: Regular users
         
         Args:
-            user: User object
+            user: User object (or row with is_core_member and created_at)
             health_score: Current health score
+            stats: Subtree stats, fetched when not given
+            now: Reference time for the account age; batch callers pass
+                one value for the whole run
             
         Returns:
             Maturity level string
@@ -90,10 +144,11 @@ class HealthService:
             return "core"
         
         # Calculate account age
-        account_age_days = (datetime.utcnow() - user.created_at).days
+        account_age_days = ((now or datetime.now(timezone.utc)) - user.created_at).days
         
         # Get subtree stats
-        stats = self.tree_service.get_subtree_stats(user.id)
+        if stats is None:
+            stats = self.tree_service.get_subtree_stats(user.id)
         
         # Supporting trunk criteria
         if (
@@ -118,26 +173,17 @@ class HealthService:
         """
         user = self.tree_service.get_user_or_404(user_id)
         
-        # Calculate health score
-        health_score = self.calculate_health_score(user_id)
-        
         # Get subtree stats
         stats = self.tree_service.get_subtree_stats(user_id)
         
+        # Calculate health score
+        health_score = self._health_from_stats(user.status, stats)
+        
         # Determine maturity
-        maturity_level = self.determine_maturity_level(user, health_score)
+        maturity_level = self.determine_maturity_level(user, health_score, stats)
         
         # Create health score record
-        health_record = UserHealthScore(
-            user_id=user_id,
-            subtree_size=stats["total_descendants"],
-            subtree_active_count=stats["active_count"],
-            subtree_flagged_count=stats["flagged_count"],
-            subtree_banned_count=stats["banned_count"],
-            overall_health=health_score,
-            max_depth_below=stats["max_depth"],
-            maturity_level=maturity_level
-        )
+        health_record = UserHealthScore(**self._health_record_values(user_id, stats, health_score, maturity_level))
         
         self.db.add(health_record)
         self.db.commit()
@@ -145,6 +191,25 @@ class HealthService:
         
         return health_record
     
+    @staticmethod
+    def _health_record_values(
+        user_id: UUID,
+        stats: Dict[str, Any],
+        health_score: float,
+        maturity_level: str
+    ) -> Dict[str, Any]:
+        """Column values of a UserHealthScore snapshot."""
+        return {
+            "user_id": user_id,
+            "subtree_size": stats["total_descendants"],
+            "subtree_active_count": stats["active_count"],
+            "subtree_flagged_count": stats["flagged_count"],
+            "subtree_banned_count": stats["banned_count"],
+            "overall_health": health_score,
+            "max_depth_below": stats["max_depth"],
+            "maturity_level": maturity_level
+        }
+    
     def get_latest_health_score(self, user_id: UUID) -> Optional[UserHealthScore]:
         """
         Get the most recent health score for a user.
@@ -163,22 +228,50 @@ class HealthService:
         """
         Background task: Calculate health scores for all active users.
         
+        Subtree statistics for everyone come from one aggregate query;
+        scores are then computed in memory and inserted in batches.
+        
         Returns:
             Number of users processed
         """
-        users = self.db.query(User).filter(
+        users = self.db.query(
+            User.id, User.status, User.is_core_member, User.created_at
+        ).filter(
             User.deleted_at == None
         ).all()
         
+        all_stats = self.tree_service.get_all_subtree_stats()
+        # Aware, like the created_at values it is compared against
+        now = datetime.now(timezone.utc)
+        
         count = 0
+        records = []
         for user in users:
+            stats = all_stats.get(user.id)
+            if stats is None:
+                # Deleted or re-created since the users were listed
+                continue
+            
             try:
-                self.calculate_and_store_health_score(user.id)
-                count += 1
-            except Exception as e:
+                health_score = self._health_from_stats(user.status, stats)
+                maturity_level = self.determine_maturity_level(user, health_score, stats, now)
+            except Exception:
                 # Log error but continue processing
-                print(f"Error calculating health score for user {user.id}: {e}")
+                logger.exception("Error calculating health score for user %s", user.id)
                 continue
+            
+            records.append(self._health_record_values(user.id, stats, health_score, maturity_level))
+            
+            if len(records) == HEALTH_SCORE_BATCH_SIZE:
+                self.db.execute(insert(UserHealthScore), records)
+                self.db.commit()
+                count += len(records)
+                records = []
+        
+        if records:
+            self.db.execute(insert(UserHealthScore), records)
+            self.db.commit()
+            count += len(records)
         
         return count
     
@@ -195,21 +288,21 @@ class HealthService:
         if threshold is None:
             threshold = settings.HEALTH_SCORE_LOW_THRESHOLD
         
-        # Get users with low health scores
-        low_health_users = self.db.query(UserHealthScore).filter(
+        # Flag active users with a recent low score in one statement
+        recent_low_scores = select(UserHealthScore.user_id).where(
             UserHealthScore.overall_health < threshold,
-            UserHealthScore.calculated_at >= datetime.utcnow() - timedelta(days=1)
-        ).all()
-        
-        flagged_count = 0
-        for health_record in low_health_users:
-            user = self.db.query(User).filter(User.id == health_record.user_id).first()
-            if user and user.status == "active":
-                user.status = "flagged"
-                flagged_count += 1
+            UserHealthScore.calculated_at >= func.now() - timedelta(days=1)
+        )
+        flagged_ids = self.db.execute(
+            update(User)
+            .where(User.status == "active", User.id.in_(recent_low_scores))
+            .values(status="flagged")
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
         
-        if flagged_count > 0:
-            self.db.commit()
+        self.db.commit()
+        if flagged_ids:
+            invalidate_cached_users(*flagged_ids)
         
-        return flagged_count
-
+        return len(flagged_ids)
@@ -2,19 +2,55 @@
 Invite service - handles invite token generation, validation, and management.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from uuid import UUID
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session, joinedload
+from uuid import UUID, uuid4
 
 from app.models.user import User
 from app.models.invite_token import InviteToken
 from app.models.audit_log import InviteAuditLog
-from app.core.security import generate_secure_token
+from app.core.security import generate_secure_token, hash_invite_token
 from app.core.exceptions import InsufficientQuotaException, bad_request_error, not_found_error
 from app.config import settings
 
 
+# Expiry as one statement: revoke every live token past its expiry, credit
+# each creator back once per expired token and write one audit entry per
+# token. The token predicate is served by ix_tokens_live_expires.
+_EXPIRE_UNUSED_TOKENS_QUERY = text("""
+WITH expired AS (
+    UPDATE invite_tokens
+    SET revoked_at = now(),
+        revoked_reason = 'Auto-expired'
+    WHERE expires_at < now()
+      AND used_at IS NULL
+      AND revoked_at IS NULL
+    RETURNING id, created_by_user_id, token, revoked_at
+),
+credited AS (
+    UPDATE users u
+    SET invites_used = u.invites_used - e.expired_count,
+        updated_at = now()
+    FROM (
+        SELECT created_by_user_id, count(*) AS expired_count
+        FROM expired
+        GROUP BY created_by_user_id
+    ) e
+    WHERE u.id = e.created_by_user_id
+),
+audit AS (
+    INSERT INTO invite_audit_log (event_type, target_user_id, invite_token_id, event_data)
+    SELECT
+        'token_expired', created_by_user_id, id,
+        jsonb_build_object('token', left(token, 8) || '...', 'expired_at', revoked_at)
+    FROM expired
+)
+SELECT count(*) FROM expired;
+""")
+
+
 class InviteService:
     """Service for invite token operations."""
     
@@ -52,49 +88,56 @@ class InviteService:
                 f"Insufficient invite quota. Available: {available}, Requested: {count}"
             )
         
-        # Generate tokens
-        tokens = []
-        expires_at = datetime.utcnow() + timedelta(hours=settings.INVITE_TOKEN_EXPIRY_HOURS)
+        # Generate tokens; ids are assigned here so audit rows can
+        # reference them without a flush
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=settings.INVITE_TOKEN_EXPIRY_HOURS)
+        token_rows = [
+            {
+                "id": uuid4(),
+                "token": generate_secure_token(),
+                "created_by_user_id": user.id,
+                "expires_at": expires_at,
+                "note": note
+            }
+            for _ in range(count)
+        ]
         
-        for _ in range(count):
-            token = InviteToken(
-                token=generate_secure_token(),
-                created_by_user_id=user.id,
-                expires_at=expires_at,
-                note=note
-            )
-            self.db.add(token)
-            tokens.append(token)
+        # Only the token prefix differs between the batch's audit entries
+        expires_at_iso = expires_at.isoformat()
+        audit_rows = [
+            {
+                "event_type": "token_created",
+                "actor_user_id": user.id,
+                "target_user_id": user.id,
+                "invite_token_id": row["id"],
+                "event_data": {
+                    "token": row["token"][:8] + "...",
+                    "expires_at": expires_at_iso,
+                    "note": note
+                },
+                "ip_address": ip_address,
+                "user_agent": user_agent
+            }
+            for row in token_rows
+        ]
         
         # Update user's invite usage
         user.invites_used += count
         
-        # Flush to get token IDs
-        self.db.flush()
-        
-        # Log to audit
-        for token in tokens:
-            audit_entry = InviteAuditLog(
-                event_type="token_created",
-                actor_user_id=user.id,
-                target_user_id=user.id,
-                invite_token_id=token.id,
-                event_data={
-                    "token": token.token[:8] + "...",
-                    "expires_at": expires_at.isoformat(),
-                    "note": note
-                },
-                ip_address=ip_address,
-                user_agent=user_agent
-            )
-            self.db.add(audit_entry)
+        # One multi-row INSERT each for tokens and their audit entries
+        self.db.execute(insert(InviteToken), token_rows)
+        self.db.execute(insert(InviteAuditLog), audit_rows)
         
         self.db.commit()
         
-        for token in tokens:
-            self.db.refresh(token)
+        # Load the created tokens (with server defaults) in one query
+        token_ids = [row["id"] for row in token_rows]
+        tokens_by_id = {
+            token.id: token
+            for token in self.db.query(InviteToken).filter(InviteToken.id.in_(token_ids))
+        }
         
-        return tokens
+        return [tokens_by_id[token_id] for token_id in token_ids]
     
     def validate_token(self, token_str: str) -> Optional[InviteToken]:
         """
@@ -106,8 +149,10 @@ class InviteService:
         Returns:
             InviteToken if valid, None otherwise
         """
-        token = self.db.query(InviteToken).filter(
-            InviteToken.token == token_str
+        token = self.db.query(InviteToken).options(
+            joinedload(InviteToken.creator)
+        ).filter(
+            InviteToken.token_hash == hash_invite_token(token_str)
         ).first()
         
         if not token:
@@ -122,6 +167,8 @@ class InviteService:
         """
         Get all tokens created by a user.
         
+        The creator is the caller, so it is not loaded per token.
+        
         Args:
             user_id: User's UUID
             
@@ -174,8 +221,7 @@ class InviteService:
             raise bad_request_error("Token is already revoked")
         
         # Revoke token
-        token.is_revoked = True
-        token.revoked_at = datetime.utcnow()
+        token.revoked_at = datetime.now(timezone.utc)
         token.revoked_by_user_id = user.id
         token.revoked_reason = reason
         
@@ -215,40 +261,7 @@ class InviteService:
         Returns:
             Number of tokens expired
         """
-        now = datetime.utcnow()
-        
-        # Find expired tokens that aren't marked as expired yet
-        expired_tokens = self.db.query(InviteToken).filter(
-            InviteToken.expires_at < now,
-            InviteToken.is_used == False,
-            InviteToken.is_revoked == False
-        ).all()
-        
-        for token in expired_tokens:
-            # Mark as revoked (expired)
-            token.is_revoked = True
-            token.revoked_reason = "Auto-expired"
-            token.revoked_at = now
-            
-            # Credit back to creator
-            creator = self.db.query(User).filter(User.id == token.created_by_user_id).first()
-            if creator:
-                creator.invites_used -= 1
-            
-            # Log to audit
-            audit_entry = InviteAuditLog(
-                event_type="token_expired",
-                actor_user_id=None,
-                target_user_id=token.created_by_user_id,
-                invite_token_id=token.id,
-                event_data={
-                    "token": token.token[:8] + "...",
-                    "expired_at": now.isoformat()
-                }
-            )
-            self.db.add(audit_entry)
-        
+        expired_count = self.db.execute(_EXPIRE_UNUSED_TOKENS_QUERY).scalar()
         self.db.commit()
         
-        return len(expired_tokens)
-
+        return expired_count
@@ -3,15 +3,85 @@ Prune service - handles branch pruning operations (soft delete).
 """
 
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import insert, text
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.models.user import User
 from app.models.prune_operation import PruneOperation
+from app.models.prune_affected_user import PruneAffectedUser
 from app.models.audit_log import InviteAuditLog
-from app.services.tree_service import TreeService
+from app.core.cache import invalidate_cached_users
 from app.core.exceptions import not_found_error, bad_request_error
+from app.core.pagination import paginate_keyset
+from app.services.tree_service import build_subtree_cte
+
+
+# Each branch member's subtree size, derived from the subtree paths (see
+# build_subtree_cte) instead of one traversal per member
+_COUNTS_CTE = """counts AS (
+    SELECT member_id AS id, count(*) - 1 AS descendants_count
+    FROM subtree, unnest(path) AS member_id
+    GROUP BY member_id
+)"""
+
+_AFFECTED_USERS_QUERY = text(build_subtree_cte(_COUNTS_CTE) + """
+SELECT st.id, st.username, st.email, st.status, st.created_at, st.depth, c.descendants_count
+FROM subtree st
+INNER JOIN counts c ON c.id = st.id
+ORDER BY st.depth, st.created_at;
+""")
+
+# Soft deletes the branch in one statement; status is read from the CTE so
+# the returned snapshot holds pre-prune values
+_PRUNE_BRANCH_QUERY = text(build_subtree_cte(_COUNTS_CTE, """pruned AS (
+    UPDATE users u
+    SET deleted_at = :deleted_at,
+        deleted_reason = :deleted_reason,
+        status = 'banned'
+    FROM subtree st
+    WHERE u.id = st.id
+    RETURNING st.id, st.username, st.email, st.status, st.created_at, st.depth
+)""") + """
+SELECT p.id, p.username, p.email, p.status, p.created_at, p.depth, c.descendants_count
+FROM pruned p
+INNER JOIN counts c ON c.id = p.id
+ORDER BY p.depth, p.created_at;
+""")
+
+
+# Restores the still-deleted members of a pruned branch from its snapshot
+# rows, returning the ids of restored users
+_RESTORE_PRUNED_USERS_QUERY = text("""
+UPDATE users u
+SET deleted_at = NULL,
+    deleted_reason = NULL,
+    status = 'active'
+FROM prune_affected_users a
+WHERE a.operation_id = :operation_id
+  AND u.id = a.user_id
+  AND u.deleted_at IS NOT NULL
+RETURNING u.id;
+""")
+
+
+def prune_preview_cache_key(root_user_id: UUID) -> str:
+    """Cache key for the dry-run preview of pruning a branch."""
+    return f"prune:preview:{root_user_id}"
+
+
+def _affected_row_to_dict(row) -> Dict[str, Any]:
+    """Convert an affected-user row to its JSON snapshot form."""
+    return {
+        "id": str(row.id),
+        "username": row.username,
+        "email": row.email,
+        "status": row.status,
+        "created_at": row.created_at.isoformat(),
+        "depth": row.depth,
+        "descendants_count": row.descendants_count
+    }
 
 
 class PruneService:
@@ -19,7 +89,6 @@ class PruneService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.tree_service = TreeService(db)
     
     def get_affected_users(self, root_user_id: UUID) -> List[Dict[str, Any]]:
         """
@@ -31,60 +100,37 @@ class PruneService:
         Returns:
             List of dicts with user information
         """
-        descendants = self.tree_service.get_descendants(root_user_id)
+        result = self.db.execute(_AFFECTED_USERS_QUERY, {"root_user_id": str(root_user_id)})
+        affected = [_affected_row_to_dict(row) for row in result]
         
-        if not descendants:
+        if not affected:
             raise not_found_error("User not found")
         
-        affected = []
-        for desc in descendants:
-            user = self.db.query(User).filter(User.id == desc["id"]).first()
-            if user:
-                # Get descendant count for this user
-                user_descendants = self.tree_service.get_descendants(user.id)
-                
-                affected.append({
-                    "id": str(user.id),
-                    "username": user.username,
-                    "email": user.email,
-                    "status": user.status,
-                    "created_at": user.created_at.isoformat(),
-                    "depth": desc["depth"],
-                    "descendants_count": len(user_descendants) - 1  # Exclude self
-                })
-        
         return affected
     
-    def execute_prune(
+    def create_prune_operation(
         self,
         root_user_id: UUID,
         reason: str,
-        executed_by_user_id: UUID,
-        ip_address: str = None,
-        user_agent: str = None
+        executed_by_user_id: UUID
     ) -> PruneOperation:
         """
-        Execute a prune operation (soft delete entire branch).
+        Validate the root user and record a pending prune operation.
+        
+        The branch itself is soft deleted by run_prune_operation, normally
+        from the prune_branch background task.
         
         Args:
             root_user_id: UUID of root user to prune
             reason: Reason for pruning
             executed_by_user_id: UUID of admin executing the prune
-            ip_address: IP address of request
-            user_agent: User agent string
             
         Returns:
-            PruneOperation object
+            Pending PruneOperation object
             
         Raises:
             HTTPException: If validation fails
         """
-        # Get all affected users
-        affected_users = self.get_affected_users(root_user_id)
-        
-        if not affected_users:
-            raise bad_request_error("No users found to prune")
-        
         # Verify root user exists and isn't a core member
         root_user = self.db.query(User).filter(User.id == root_user_id).first()
         if not root_user:
@@ -96,70 +142,170 @@ class PruneService:
         if root_user.is_deleted:
             raise bad_request_error("User is already deleted")
         
-        # Create prune operation record
         prune_op = PruneOperation(
             root_user_id=root_user_id,
-            affected_user_count=len(affected_users),
+            affected_user_count=0,
             reason=reason,
             executed_by_user_id=executed_by_user_id,
-            status="pending",
-            affected_users=affected_users
+            status="pending"
         )
         
         self.db.add(prune_op)
-        self.db.flush()  # Get prune_op.id
+        self.db.commit()
+        self.db.refresh(prune_op)
+        
+        return prune_op
+    
+    def run_prune_operation(
+        self,
+        operation_id: UUID,
+        ip_address: str = None,
+        user_agent: str = None
+    ) -> PruneOperation:
+        """
+        Soft delete the branch of a pending prune operation.
+        
+        The whole branch is found and updated by a single statement; the
+        rows it returns are bulk inserted as the rollback snapshot and
+        audit entries.
+        
+        Args:
+            operation_id: UUID of a pending operation
+            ip_address: IP address of the original request
+            user_agent: User agent of the original request
+            
+        Returns:
+            Completed PruneOperation object
+        """
+        prune_op = self.get_prune_operation(operation_id)
+        
+        if prune_op.status != "pending":
+            return prune_op
         
-        # Soft delete all affected users
         now = datetime.utcnow()
-        for affected in affected_users:
-            user = self.db.query(User).filter(User.id == affected["id"]).first()
-            if user and not user.is_deleted:
-                user.deleted_at = now
-                user.deleted_reason = f"Pruned: {reason}"
-                user.status = "banned"
-                
-                # Log to audit
-                audit_entry = InviteAuditLog(
-                    event_type="user_pruned",
-                    actor_user_id=executed_by_user_id,
-                    target_user_id=user.id,
-                    event_data={
-                        "prune_operation_id": str(prune_op.id),
-                        "reason": reason,
-                        "depth": affected["depth"]
-                    },
-                    ip_address=ip_address,
-                    user_agent=user_agent
-                )
-                self.db.add(audit_entry)
+        result = self.db.execute(
+            _PRUNE_BRANCH_QUERY,
+            {
+                "root_user_id": str(prune_op.root_user_id),
+                "deleted_at": now,
+                "deleted_reason": f"Pruned: {prune_op.reason}"
+            }
+        )
+        affected_users = [_affected_row_to_dict(row) for row in result]
+        
+        if affected_users:
+            # Snapshot rows for rollback
+            self.db.execute(
+                insert(PruneAffectedUser),
+                [
+                    {
+                        "operation_id": prune_op.id,
+                        "user_id": affected["id"],
+                        "snapshot": affected
+                    }
+                    for affected in affected_users
+                ]
+            )
+            
+            # Log to audit
+            self.db.execute(
+                insert(InviteAuditLog),
+                [
+                    {
+                        "event_type": "user_pruned",
+                        "actor_user_id": prune_op.executed_by_user_id,
+                        "target_user_id": affected["id"],
+                        "event_data": {
+                            "prune_operation_id": str(prune_op.id),
+                            "reason": prune_op.reason,
+                            "depth": affected["depth"]
+                        },
+                        "ip_address": ip_address,
+                        "user_agent": user_agent
+                    }
+                    for affected in affected_users
+                ]
+            )
         
         # Mark operation as completed
+        prune_op.affected_user_count = len(affected_users)
         prune_op.status = "completed"
         prune_op.executed_at = now
         
         self.db.commit()
         self.db.refresh(prune_op)
         
+        invalidate_cached_users(*(affected["id"] for affected in affected_users))
+        
         return prune_op
     
+    def mark_prune_failed(self, operation_id: UUID) -> None:
+        """
+        Mark a pending prune operation as failed.
+        
+        Args:
+            operation_id: UUID of operation
+        """
+        self.db.rollback()
+        self.db.query(PruneOperation).filter(
+            PruneOperation.id == operation_id,
+            PruneOperation.status == "pending"
+        ).update({"status": "failed"}, synchronize_session=False)
+        self.db.commit()
+    
+    def execute_prune(
+        self,
+        root_user_id: UUID,
+        reason: str,
+        executed_by_user_id: UUID,
+        ip_address: str = None,
+        user_agent: str = None
+    ) -> PruneOperation:
+        """
+        Execute a prune operation synchronously (soft delete entire branch).
+        
+        Args:
+            root_user_id: UUID of root user to prune
+            reason: Reason for pruning
+            executed_by_user_id: UUID of admin executing the prune
+            ip_address: IP address of request
+            user_agent: User agent string
+            
+        Returns:
+            PruneOperation object
+            
+        Raises:
+            HTTPException: If validation fails
+        """
+        prune_op = self.create_prune_operation(root_user_id, reason, executed_by_user_id)
+        return self.run_prune_operation(prune_op.id, ip_address, user_agent)
+    
     def get_prune_operations(
         self,
         limit: int = 100,
-        offset: int = 0
-    ) -> List[PruneOperation]:
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[PruneOperation], Optional[str]]:
         """
-        Get prune operation history.
+        Get prune operation history, newest first.
         
         Args:
             limit: Maximum number of operations to return
-            offset: Number of operations to skip
+            offset: Number of operations to skip when no cursor is given
+            cursor: Cursor from a previous page
             
         Returns:
-            List of PruneOperation objects
+            Tuple of (PruneOperation objects, next_cursor)
         """
-        return self.db.query(PruneOperation).order_by(
-            PruneOperation.created_at.desc()
-        ).offset(offset).limit(limit).all()
+        return paginate_keyset(
+            self.db.query(PruneOperation),
+            PruneOperation.created_at,
+            PruneOperation.id,
+            limit,
+            cursor=cursor,
+            offset=offset,
+            id_type=UUID
+        )
     
     def get_prune_operation(self, operation_id: UUID) -> PruneOperation:
         """
@@ -203,25 +349,29 @@ class PruneService:
         if operation.status != "completed":
             raise bad_request_error("Can only rollback completed operations")
         
-        # Restore all affected users
-        for affected in operation.affected_users:
-            user = self.db.query(User).filter(User.id == affected["id"]).first()
-            if user and user.is_deleted:
-                user.deleted_at = None
-                user.deleted_reason = None
-                user.status = "active"  # Or restore original status
-                
-                # Log rollback
-                audit_entry = InviteAuditLog(
-                    event_type="prune_rolled_back",
-                    actor_user_id=executed_by_user_id,
-                    target_user_id=user.id,
-                    event_data={
-                        "prune_operation_id": str(operation_id),
-                        "original_reason": operation.reason
+        # Restore all affected users in one statement
+        restored_ids = self.db.execute(
+            _RESTORE_PRUNED_USERS_QUERY,
+            {"operation_id": str(operation_id)}
+        ).scalars().all()
+        
+        # Log rollback
+        if restored_ids:
+            self.db.execute(
+                insert(InviteAuditLog),
+                [
+                    {
+                        "event_type": "prune_rolled_back",
+                        "actor_user_id": executed_by_user_id,
+                        "target_user_id": user_id,
+                        "event_data": {
+                            "prune_operation_id": str(operation_id),
+                            "original_reason": operation.reason
+                        }
                     }
-                )
-                self.db.add(audit_entry)
+                    for user_id in restored_ids
+                ]
+            )
         
         operation.status = "rolled_back"
         
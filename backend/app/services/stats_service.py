@@ -0,0 +1,78 @@
+"""
+Stats service - admin dashboard aggregates.
+"""
+
+from typing import Dict, Any
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.invite_token import InviteToken
+from app.models.health_score import UserHealthScore
+from app.core.cache import cache_set
+from app.config import settings
+
+
+# Cached dashboard stats, in AdminStatsResponse form
+ADMIN_STATS_CACHE_KEY = "admin:stats"
+
+
+class StatsService:
+    """Service computing and caching admin dashboard statistics."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def compute_admin_stats(self) -> Dict[str, Any]:
+        """
+        Aggregate user, invite and health statistics.
+        
+        Returns:
+            Dict with the AdminStatsResponse fields
+        """
+        # User counts (one scan of users with filtered aggregates)
+        not_deleted = User.deleted_at == None
+        user_counts = self.db.query(
+            func.count().filter(not_deleted).label("total"),
+            func.count().filter(not_deleted, User.status == "active").label("active"),
+            func.count().filter(not_deleted, User.status == "flagged").label("flagged"),
+            func.count().filter(not_deleted, User.status == "banned").label("banned"),
+            func.count().filter(not_deleted, User.status == "suspended").label("suspended"),
+            func.count().filter(User.deleted_at != None).label("deleted")
+        ).select_from(User).one()
+        
+        # Invite stats
+        invite_counts = self.db.query(
+            func.count().label("total"),
+            func.count().filter(InviteToken.used_at != None).label("used")
+        ).select_from(InviteToken).one()
+        
+        # Health score average and low health users
+        avg_health, low_health = self.db.query(
+            func.avg(UserHealthScore.overall_health),
+            func.coalesce(func.sum(case((UserHealthScore.overall_health < 50, 1), else_=0)), 0)
+        ).one()
+        
+        return {
+            "total_users": user_counts.total,
+            "active_users": user_counts.active,
+            "flagged_users": user_counts.flagged,
+            "banned_users": user_counts.banned,
+            "suspended_users": user_counts.suspended,
+            "deleted_users": user_counts.deleted,
+            "total_invites_issued": invite_counts.total,
+            "total_invites_used": invite_counts.used,
+            "avg_health_score": float(avg_health or 0.0),
+            "low_health_users": int(low_health)
+        }
+    
+    def refresh_admin_stats(self) -> Dict[str, Any]:
+        """
+        Recompute the dashboard statistics and store them in the cache.
+        
+        Returns:
+            Dict with the AdminStatsResponse fields
+        """
+        stats = self.compute_admin_stats()
+        cache_set(ADMIN_STATS_CACHE_KEY, stats, settings.ADMIN_STATS_CACHE_SECONDS)
+        return stats
@@ -11,22 +11,175 @@ from app.models.user import User
 from app.core.exceptions import not_found_error
 
 
+def build_subtree_cte(*extra_ctes: str, depth_limited: bool = False) -> str:
+    """
+    Build the WITH clause selecting a user's branch as `subtree`.
+    
+    The subtree is read from the GIN-indexed materialized tree_path rather
+    than walked recursively. Members below a deleted user are left out, as
+    a walk from the root would stop at the deleted user. Binds
+    :root_user_id (and :max_depth when depth_limited); an empty subtree
+    means the root is missing or deleted.
+    
+    Args:
+        extra_ctes: Further `name AS (...)` CTEs appended after subtree
+        depth_limited: Limit members to :max_depth levels below the root
+        
+    Returns:
+        WITH clause to prefix a query with
+    """
+    depth_filter = (
+        "\n      AND (:max_depth IS NULL OR u.depth - r.depth <= :max_depth)"
+        if depth_limited else ""
+    )
+    ctes = [
+        """root AS (
+    SELECT id, depth
+    FROM users
+    WHERE id = :root_user_id
+      AND deleted_at IS NULL
+)""",
+        f"""subtree AS (
+    SELECT 
+        u.id,
+        u.username,
+        u.email,
+        u.status,
+        u.invited_by_user_id,
+        u.created_at,
+        u.depth - r.depth AS depth,
+        u.tree_path[r.depth + 1:] AS path
+    FROM users u
+    CROSS JOIN root r
+    WHERE u.tree_path @> ARRAY[CAST(:root_user_id AS uuid)]
+      AND u.deleted_at IS NULL{depth_filter}
+      AND NOT (u.tree_path && ARRAY(
+          SELECT d.id
+          FROM users d
+          WHERE d.tree_path @> ARRAY[CAST(:root_user_id AS uuid)]
+            AND d.deleted_at IS NOT NULL
+      ))
+)""",
+        *extra_ctes,
+    ]
+    return "\nWITH " + ",\n".join(ctes)
+
+
+# Queries are built once at import time; sessions only bind params.
+_SUBTREE_CTE = build_subtree_cte(depth_limited=True)
+
+_DESCENDANTS_QUERY = text(_SUBTREE_CTE + """
+SELECT * FROM subtree
+ORDER BY depth, created_at;
+""")
+
+# Subtree statistics aggregated in SQL; the root itself (depth 0) is excluded.
+# Per-level total/active counts feed the health score (level 1's total is
+# direct_invites).
+_SUBTREE_STATS_QUERY = text(_SUBTREE_CTE + """
+SELECT
+    count(*) FILTER (WHERE depth > 0) AS total_descendants,
+    count(*) FILTER (WHERE depth > 0 AND status = 'active') AS active_count,
+    count(*) FILTER (WHERE depth > 0 AND status = 'flagged') AS flagged_count,
+    count(*) FILTER (WHERE depth > 0 AND status = 'banned') AS banned_count,
+    count(*) FILTER (WHERE depth > 0 AND status = 'suspended') AS suspended_count,
+    coalesce(max(depth), 0) AS max_depth,
+    count(*) FILTER (WHERE depth = 1) AS direct_invites,
+    count(*) FILTER (WHERE depth = 1 AND status = 'active') AS level1_active,
+    count(*) FILTER (WHERE depth = 2) AS level2_total,
+    count(*) FILTER (WHERE depth = 2 AND status = 'active') AS level2_active,
+    count(*) FILTER (WHERE depth >= 3) AS level3_total,
+    count(*) FILTER (WHERE depth >= 3 AND status = 'active') AS level3_active
+FROM subtree;
+""")
+
+# Descendants with each one's latest health score, for tree visualization
+_TREE_QUERY = text(_SUBTREE_CTE + """
+SELECT st.*, h.overall_health, h.maturity_level
+FROM subtree st
+LEFT JOIN LATERAL (
+    SELECT overall_health, maturity_level
+    FROM user_health_scores
+    WHERE user_id = st.id
+    ORDER BY calculated_at DESC
+    LIMIT 1
+) h ON true
+ORDER BY st.depth, st.created_at;
+""")
+
+# Subtree statistics of every live user in one pass: each live user is
+# counted under each ancestor on its tree_path below the deepest deleted
+# one, mirroring build_subtree_cte's cut-off. Every live user is its own
+# ancestor at depth 0, so all of them get a row.
+_ALL_SUBTREE_STATS_QUERY = text("""
+WITH deleted AS (
+    SELECT id FROM users WHERE deleted_at IS NOT NULL
+),
+edges AS (
+    SELECT
+        p.ancestor_id,
+        u.depth - (p.pos - 1) AS depth,
+        u.status
+    FROM users u
+    CROSS JOIN LATERAL unnest(u.tree_path) WITH ORDINALITY AS p(ancestor_id, pos)
+    WHERE u.deleted_at IS NULL
+      AND p.pos > coalesce((
+          SELECT max(q.pos)
+          FROM unnest(u.tree_path) WITH ORDINALITY AS q(id, pos)
+          WHERE q.id IN (SELECT id FROM deleted)
+      ), 0)
+)
+SELECT
+    ancestor_id AS user_id,
+    count(*) FILTER (WHERE depth > 0) AS total_descendants,
+    count(*) FILTER (WHERE depth > 0 AND status = 'active') AS active_count,
+    count(*) FILTER (WHERE depth > 0 AND status = 'flagged') AS flagged_count,
+    count(*) FILTER (WHERE depth > 0 AND status = 'banned') AS banned_count,
+    count(*) FILTER (WHERE depth > 0 AND status = 'suspended') AS suspended_count,
+    max(depth) AS max_depth,
+    count(*) FILTER (WHERE depth = 1) AS direct_invites,
+    count(*) FILTER (WHERE depth = 1 AND status = 'active') AS level1_active,
+    count(*) FILTER (WHERE depth = 2) AS level2_total,
+    count(*) FILTER (WHERE depth = 2 AND status = 'active') AS level2_active,
+    count(*) FILTER (WHERE depth >= 3) AS level3_total,
+    count(*) FILTER (WHERE depth >= 3 AND status = 'active') AS level3_active
+FROM edges
+GROUP BY ancestor_id;
+""")
+
+# Ancestors are exactly the ids on the user's tree_path
+_ANCESTORS_QUERY = text("""
+SELECT 
+    u.id,
+    u.username,
+    u.email,
+    u.status,
+    u.invited_by_user_id,
+    u.created_at,
+    t.depth - u.depth AS hops_to_root
+FROM users t
+INNER JOIN users u ON u.id = ANY(t.tree_path)
+WHERE t.id = :user_id
+ORDER BY hops_to_root DESC;
+""")
+
+
 class TreeService:
     """Service for invite tree operations and graph traversal."""
     
     def __init__(self, db: Session):
         self.db = db
     
-    def get_user_or_404(self, user_id: UUID) -> User:
-        """Get user by ID or raise 404."""
-        user = self.db.query(User).filter(User.id == user_id).first()
+    def get_user_or_404(self, user_id: UUID, *options) -> User:
+        """Get user by ID or raise 404, applying optional loader options."""
+        user = self.db.query(User).options(*options).filter(User.id == user_id).first()
         if not user:
             raise not_found_error("User not found")
         return user
     
     def get_descendants(self, root_user_id: UUID, max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get all descendants of a user using recursive CTE.
+        Get all descendants of a user from the materialized tree paths.
         
         Args:
             root_user_id: UUID of root user
@@ -35,45 +188,8 @@ class TreeService:
         Returns:
             List of dicts containing descendant information
         """
-        query = text("""
-            WITH RECURSIVE subtree AS (
-                -- Base case: start with the root user
-                SELECT 
-                    id,
-                    username,
-                    email,
-                    status,
-                    invited_by_user_id,
-                    created_at,
-                    0 as depth,
-                    ARRAY[id] as path
-                FROM users
-                WHERE id = :root_user_id
-                  AND deleted_at IS NULL
-                
-                UNION ALL
-                
-                -- Recursive case: get children
-                SELECT 
-                    u.id,
-                    u.username,
-                    u.email,
-                    u.status,
-                    u.invited_by_user_id,
-                    u.created_at,
-                    st.depth + 1,
-                    st.path || u.id
-                FROM users u
-                INNER JOIN subtree st ON u.invited_by_user_id = st.id
-                WHERE u.deleted_at IS NULL
-                  AND (:max_depth IS NULL OR st.depth < :max_depth)
-            )
-            SELECT * FROM subtree
-            ORDER BY depth, created_at;
-        """)
-        
         result = self.db.execute(
-            query,
+            _DESCENDANTS_QUERY,
             {"root_user_id": str(root_user_id), "max_depth": max_depth}
         )
         
@@ -102,39 +218,7 @@ class TreeService:
         Returns:
             List of dicts containing ancestor information
         """
-        query = text("""
-            WITH RECURSIVE ancestors AS (
-                -- Base case: start with the user
-                SELECT 
-                    id,
-                    username,
-                    email,
-                    status,
-                    invited_by_user_id,
-                    created_at,
-                    0 as hops_to_root
-                FROM users
-                WHERE id = :user_id
-                
-                UNION ALL
-                
-                -- Recursive case: climb up
-                SELECT 
-                    u.id,
-                    u.username,
-                    u.email,
-                    u.status,
-                    u.invited_by_user_id,
-                    u.created_at,
-                    a.hops_to_root + 1
-                FROM users u
-                INNER JOIN ancestors a ON a.invited_by_user_id = u.id
-            )
-            SELECT * FROM ancestors
-            ORDER BY hops_to_root DESC;
-        """)
-        
-        result = self.db.execute(query, {"user_id": str(user_id)})
+        result = self.db.execute(_ANCESTORS_QUERY, {"user_id": str(user_id)})
         
         ancestors = []
         for row in result:
@@ -160,42 +244,34 @@ class TreeService:
         Returns:
             Dict with subtree statistics
         """
-        descendants = self.get_descendants(user_id)
-        
-        if not descendants:
-            return {
-                "total_descendants": 0,
-                "active_count": 0,
-                "flagged_count": 0,
-                "banned_count": 0,
-                "suspended_count": 0,
-                "max_depth": 0,
-                "direct_invites": 0
-            }
+        row = self.db.execute(
+            _SUBTREE_STATS_QUERY,
+            {"root_user_id": str(user_id), "max_depth": None}
+        ).one()
+        
+        return dict(row._mapping)
+    
+    def get_all_subtree_stats(self) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Get subtree statistics for every live user in a single query.
+        
+        Entries have the same fields as get_subtree_stats.
+        
+        Returns:
+            Dict mapping user id to its subtree statistics
+        """
+        result = self.db.execute(_ALL_SUBTREE_STATS_QUERY)
         
-        # Calculate stats
-        total = len(descendants) - 1  # Exclude root user
-        active = sum(1 for d in descendants if d["status"] == "active") - 1
-        flagged = sum(1 for d in descendants if d["status"] == "flagged")
-        banned = sum(1 for d in descendants if d["status"] == "banned")
-        suspended = sum(1 for d in descendants if d["status"] == "suspended")
-        max_depth = max(d["depth"] for d in descendants)
-        direct_invites = sum(1 for d in descendants if d["depth"] == 1)
-        
-        return {
-            "total_descendants": total,
-            "active_count": active,
-            "flagged_count": flagged,
-            "banned_count": banned,
-            "suspended_count": suspended,
-            "max_depth": max_depth,
-            "direct_invites": direct_invites
-        }
+        return {row.user_id: dict(row._mapping) for row in result}
     
     def build_tree_structure(self, root_user_id: UUID, max_depth: int = 5) -> Dict[str, Any]:
         """
         Build a nested tree structure for visualization.
         
+        Descendants and their latest health scores are loaded in one query;
+        rows arrive ordered by depth, so each parent exists before its
+        children are attached.
+        
         Args:
             root_user_id: UUID of root user
             max_depth: Maximum depth to include
@@ -203,23 +279,40 @@ class TreeService:
         Returns:
             Nested dict representing the tree
         """
-        descendants = self.get_descendants(root_user_id, max_depth)
-        
-        if not descendants:
-            raise not_found_error("User not found")
-        
-        # Build lookup dict
-        nodes = {d["id"]: {**d, "children": []} for d in descendants}
+        result = self.db.execute(
+            _TREE_QUERY,
+            {"root_user_id": str(root_user_id), "max_depth": max_depth}
+        )
         
-        # Build tree structure
+        # Build lookup dict and tree structure in a single pass
         root = None
-        for node_id, node in nodes.items():
-            if node["invited_by_user_id"] and node["invited_by_user_id"] in nodes:
-                parent = nodes[node["invited_by_user_id"]]
+        nodes = {}
+        for row in result:
+            node = {
+                "id": str(row.id),
+                "username": row.username,
+                "email": row.email,
+                "status": row.status,
+                "invited_by_user_id": str(row.invited_by_user_id) if row.invited_by_user_id else None,
+                "created_at": row.created_at,
+                "depth": row.depth,
+                "health_score": float(row.overall_health) if row.overall_health is not None else None,
+                "maturity_level": row.maturity_level or "branch",
+                "children_count": 0,
+                "children": []
+            }
+            nodes[node["id"]] = node
+            
+            parent = nodes.get(node["invited_by_user_id"]) if row.depth > 0 else None
+            if parent is not None:
                 parent["children"].append(node)
+                parent["children_count"] += 1
             else:
                 root = node
         
+        if root is None:
+            raise not_found_error("User not found")
+        
         return root
     
     def get_direct_invitees(self, user_id: UUID) -> List[User]:
@@ -25,7 +25,7 @@ celery_app.conf.update(
 )
 
 # Import tasks to register them
-from app.tasks import invite_tasks, health_tasks
+from app.tasks import invite_tasks, health_tasks, prune_tasks, admin_tasks
 
 __all__ = ["celery_app"]
 
@@ -0,0 +1,46 @@
+"""
+Background tasks for the admin dashboard.
+"""
+
+from celery import Task
+
+from app.tasks import celery_app
+from app.database import SessionLocal
+from app.services.stats_service import StatsService
+from app.config import settings
+
+
+class DatabaseTask(Task):
+    """Base task with database session."""
+    
+    def __call__(self, *args, **kwargs):
+        db = SessionLocal()
+        try:
+            return self.run(*args, db=db, **kwargs)
+        finally:
+            db.close()
+
+
+@celery_app.task(base=DatabaseTask, name="tasks.refresh_admin_stats")
+def refresh_admin_stats(db=None):
+    """
+    Recompute the cached admin dashboard statistics.
+    
+    Runs more often than the cache expires, so the stats endpoint is
+    served from the cache instead of aggregating on request.
+    """
+    stats = StatsService(db).refresh_admin_stats()
+    
+    return {
+        "total_users": stats["total_users"],
+        "status": "completed"
+    }
+
+
+# Add to beat schedule
+celery_app.conf.beat_schedule.update({
+    "refresh-admin-stats": {
+        "task": "tasks.refresh_admin_stats",
+        "schedule": float(settings.ADMIN_STATS_REFRESH_SECONDS),
+    },
+})
@@ -3,12 +3,13 @@ Background tasks for health score calculation.
 """
 
 from celery import Task
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.tasks import celery_app
 from app.database import SessionLocal
 from app.services.health_service import HealthService
 from app.models.user import User
+from app.models.audit_log import InviteAuditLog
 
 
 class DatabaseTask(Task):
@@ -65,9 +66,6 @@ def adjust_invite_quotas(db=None):
     
     Runs daily.
     """
-    from app.models.audit_log import InviteAuditLog
-    from app.config import settings
-    
     # Get users eligible for quota increase
     users = db.query(User).filter(
         User.deleted_at == None,
@@ -75,11 +73,13 @@ def adjust_invite_quotas(db=None):
         User.invites_available < 3  # Only adjust if running low
     ).all()
     
+    # Aware, like the created_at values it is compared against
+    now = datetime.now(timezone.utc)
     adjusted_count = 0
     for user in users:
         # Simple logic: grant 1 additional invite per month of good standing
         # In production, this would be more sophisticated
-        account_age_days = (datetime.utcnow() - user.created_at).days
+        account_age_days = (now - user.created_at).days
         
         if account_age_days >= 30 and user.invite_quota < 50:
             additional = 1
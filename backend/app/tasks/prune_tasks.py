@@ -0,0 +1,52 @@
+"""
+Background tasks for branch pruning.
+"""
+
+from celery import Task
+from uuid import UUID
+
+from app.tasks import celery_app
+from app.database import SessionLocal
+from app.services.prune_service import PruneService, prune_preview_cache_key
+from app.core.cache import cache_delete, invalidate_namespace, ADMIN_CACHE_NAMESPACE
+
+
+class DatabaseTask(Task):
+    """Base task with database session."""
+    
+    def __call__(self, *args, **kwargs):
+        db = SessionLocal()
+        try:
+            return self.run(*args, db=db, **kwargs)
+        finally:
+            db.close()
+
+
+@celery_app.task(base=DatabaseTask, name="tasks.prune_branch")
+def prune_branch(operation_id: str, ip_address: str = None, user_agent: str = None, db=None):
+    """
+    Soft delete the branch of a pending prune operation.
+    
+    Queued by the admin prune endpoint.
+    """
+    prune_service = PruneService(db)
+    
+    try:
+        operation = prune_service.run_prune_operation(
+            UUID(operation_id),
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    except Exception:
+        prune_service.mark_prune_failed(UUID(operation_id))
+        raise
+    finally:
+        invalidate_namespace(ADMIN_CACHE_NAMESPACE)
+    
+    cache_delete(prune_preview_cache_key(operation.root_user_id))
+    
+    return {
+        "operation_id": operation_id,
+        "affected_count": operation.affected_user_count,
+        "status": operation.status
+    }
@@ -0,0 +1,144 @@
+"""
+Tests for invite-token registration.
+"""
+
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+
+from app.services.auth_service import AuthService
+from app.models.user import User
+from app.models.invite_token import InviteToken
+from app.models.audit_log import InviteAuditLog
+from app.core.security import generate_secure_token
+from app.database import SessionLocal
+
+
+@pytest.fixture
+def db():
+    """Create database session for testing."""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def inviter(db):
+    """Create an inviter one level below a root user."""
+    suffix = uuid4().hex[:8]
+    root = User(
+        id=uuid4(),
+        email=f"reg_root_{suffix}@example.com",
+        username=f"reg_root_{suffix}",
+        password_hash="dummy",
+        is_core_member=True,
+        status="active",
+        invite_quota=100
+    )
+    db.add(root)
+    db.flush()
+    
+    inviter = User(
+        id=uuid4(),
+        email=f"reg_inviter_{suffix}@example.com",
+        username=f"reg_inviter_{suffix}",
+        password_hash="dummy",
+        invited_by_user_id=root.id,
+        status="active"
+    )
+    db.add(inviter)
+    db.commit()
+    
+    return inviter
+
+
+def _make_token(db, inviter, **overrides) -> InviteToken:
+    """Create an invite token from the inviter (valid unless overridden)."""
+    values = {
+        "token": generate_secure_token(),
+        "created_by_user_id": inviter.id,
+        "expires_at": datetime.now(timezone.utc) + timedelta(hours=24),
+    }
+    values.update(overrides)
+    
+    token = InviteToken(**values)
+    db.add(token)
+    db.commit()
+    return token
+
+
+def _register(db, token: InviteToken) -> User:
+    """Register a fresh user with the token."""
+    suffix = uuid4().hex[:8]
+    return AuthService(db).register_user(
+        email=f"new_{suffix}@example.com",
+        username=f"new_{suffix}",
+        password="correct horse battery staple",
+        invite_token_str=token.token
+    )
+
+
+def _audit_rows(db, token: InviteToken) -> list:
+    """Audit entries written for the token's use."""
+    return db.query(InviteAuditLog).filter(
+        InviteAuditLog.invite_token_id == token.id,
+        InviteAuditLog.event_type == "token_used"
+    ).all()
+
+
+def test_register_with_valid_token(db, inviter):
+    """Test registration places the user under the inviter and audits it."""
+    token = _make_token(db, inviter)
+    
+    user = _register(db, token)
+    
+    assert user.invited_by_user_id == inviter.id
+    assert user.tree_path == inviter.tree_path + [user.id]
+    assert user.depth == inviter.depth + 1
+    assert user.status == "active"
+    
+    db.refresh(token)
+    assert token.used_by_user_id == user.id
+    assert token.used_at is not None
+    
+    audit_rows = _audit_rows(db, token)
+    assert len(audit_rows) == 1
+    assert audit_rows[0].actor_user_id == user.id
+    assert audit_rows[0].target_user_id == inviter.id
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"used_at": datetime.now(timezone.utc)}, "Invite token has already been used"),
+    ({"revoked_at": datetime.now(timezone.utc)}, "Invite token has been revoked"),
+    ({"expires_at": datetime.now(timezone.utc) - timedelta(hours=1)}, "Invite token has expired"),
+])
+def test_register_with_unusable_token(db, inviter, overrides, message):
+    """Test used, revoked and expired tokens are rejected without side effects."""
+    token = _make_token(db, inviter, **overrides)
+    user_count = db.query(User).count()
+    
+    with pytest.raises(HTTPException) as exc_info:
+        _register(db, token)
+    
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == message
+    assert db.query(User).count() == user_count
+    assert _audit_rows(db, token) == []
+
+
+def test_register_token_claimed_once(db, inviter):
+    """Test a second registration with the same token fails."""
+    token = _make_token(db, inviter)
+    first = _register(db, token)
+    user_count = db.query(User).count()
+    
+    with pytest.raises(HTTPException) as exc_info:
+        _register(db, token)
+    
+    assert exc_info.value.detail == "Invite token has already been used"
+    assert db.query(User).count() == user_count
+    
+    db.refresh(token)
+    assert token.used_by_user_id == first.id
+    assert len(_audit_rows(db, token)) == 1
@@ -0,0 +1,73 @@
+"""
+Tests for security utilities (no database required).
+"""
+
+import pytest
+import bcrypt
+import time
+from datetime import timedelta
+from jose import jwt, ExpiredSignatureError
+
+from app.core.security import (
+    _decode_token, _encode_token, create_access_token, hash_password, verify_password, verify_token
+)
+from app.config import settings
+
+
+@pytest.mark.skipif(settings.JWT_ALGORITHM != "HS256", reason="HS256 fast path only")
+@pytest.mark.parametrize("payload", [
+    {"sub": "6f1c2d3e-0000-4000-8000-000000000001", "exp": 1893456000, "type": "access"},
+    {"sub": "user", "exp": 1893456000, "name": "Zoë Ångström", "note": "日本語 ✓"},
+])
+def test_encode_token_matches_jose(payload):
+    """Test the HS256 fast path produces jose's token, which jose accepts."""
+    token = _encode_token(payload)
+    
+    assert token == jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
+    assert jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"]) == payload
+
+
+@pytest.mark.slow
+def test_cached_token_still_expires():
+    """Test a token verified once is rejected from the cache after exp."""
+    token = create_access_token("expiring-user", expires_delta=timedelta(seconds=1))
+    
+    payload = verify_token(token)
+    assert payload["sub"] == "expiring-user"
+    
+    time.sleep(payload["exp"] - time.time() + 1)
+    hits = _decode_token.cache_info().hits
+    
+    with pytest.raises(ExpiredSignatureError):
+        verify_token(token)
+    
+    # Rejected by the expiry re-check, not by a fresh decode
+    assert _decode_token.cache_info().hits == hits + 1
+
+
+@pytest.mark.parametrize("password", [
+    "p" * 100,
+    "é" * 50,  # 100 bytes, cut mid-character at 72
+])
+def test_verify_long_password_against_passlib_hash(password):
+    """Test passwords over 72 bytes verify against hashes made the passlib way."""
+    # passlib's bcrypt handler hashed the first 72 bytes under a $2b$ prefix
+    stored_hash = bcrypt.hashpw(
+        password.encode("utf-8")[:72], bcrypt.gensalt(rounds=4, prefix=b"2b")
+    ).decode("ascii")
+    
+    assert stored_hash.startswith("$2b$")
+    assert verify_password(password, stored_hash)
+    assert verify_password(password, hash_password(password))
+    assert not verify_password("p" * 71, stored_hash)
+
+
+@pytest.mark.parametrize("stored_hash", [
+    "",
+    "dummy",
+    "$2b$04$truncated",
+    "$argon2id$v=19$m=65536,t=3,p=4$c2FsdA$aGFzaA",
+])
+def test_verify_password_malformed_hash(stored_hash):
+    """Test a malformed stored hash fails verification instead of raising."""
+    assert verify_password("any password", stored_hash) is False
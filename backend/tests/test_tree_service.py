@@ -114,6 +114,18 @@ def test_get_descendants(db, sample_tree):
     assert all(d["depth"] == 2 for d in grandchild_nodes)
 
 
+def test_tree_path_set_on_insert(sample_tree):
+    """Test materialized tree paths are derived from the inviter on insert."""
+    root = sample_tree["root"]
+    child1 = sample_tree["child1"]
+    grandchild1 = sample_tree["grandchild1"]
+    
+    assert root.tree_path == [root.id]
+    assert root.depth == 0
+    assert grandchild1.tree_path == [root.id, child1.id, grandchild1.id]
+    assert grandchild1.depth == 2
+
+
 def test_get_ancestors(db, sample_tree):
     """Test getting path to root."""
     tree_service = TreeService(db)
@@ -150,6 +162,21 @@ def test_get_subtree_stats(db, sample_tree):
     assert stats["direct_invites"] == 2  # child1, child2
 
 
+def test_get_all_subtree_stats(db, sample_tree):
+    """Test the all-users aggregate agrees with per-user subtree stats."""
+    tree_service = TreeService(db)
+    
+    all_stats = tree_service.get_all_subtree_stats()
+    
+    for user in sample_tree.values():
+        stats = tree_service.get_subtree_stats(user.id)
+        assert {key: all_stats[user.id][key] for key in stats} == stats
+    
+    root_stats = all_stats[sample_tree["root"].id]
+    assert root_stats["level2_total"] == 2
+    assert root_stats["level2_active"] == 1  # grandchild2 is flagged
+
+
 def test_build_tree_structure(db, sample_tree):
     """Test building nested tree structure."""
     tree_service = TreeService(db)
@@ -170,6 +197,21 @@ def test_build_tree_structure(db, sample_tree):
     assert "grandchild2" in grandchild_usernames
 
 
+def test_build_tree_structure_health_and_counts(db, sample_tree):
+    """Test tree nodes carry children counts and default health data."""
+    tree_service = TreeService(db)
+    root = sample_tree["root"]
+    
+    tree = tree_service.build_tree_structure(root.id, max_depth=1)
+    
+    assert tree["children_count"] == 2
+    assert tree["health_score"] is None
+    assert tree["maturity_level"] == "branch"
+    
+    # Depth limit stops below the children
+    assert all(c["children"] == [] for c in tree["children"])
+
+
 def test_get_direct_invitees(db, sample_tree):
     """Test getting users directly invited by a user."""
     tree_service = TreeService(db)